@@ -1,5 +1,8 @@
 import requests
-from bs4 import BeautifulSoup
+from parser_backends import escolher_backend, parse_html
+from page_parser import CAMPOS, plano_extracao
+from price_normalizer import normalizar_precos, locale_do_site
+from sites import SITES_SUPORTADOS as SITES
 import pandas as pd
 import time
 import urllib.parse
@@ -13,34 +16,11 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
 }
 
-# Dicionário de sites suportados
+# Menu numerado sobre a configuração canônica de sites.py (só os sites que
+# construir_url_busca e coletar_produtos sabem paginar)
 SITES_SUPORTADOS = {
-    "1": {
-        "nome": "Mercado Livre",
-        "base_url": "https://lista.mercadolivre.com.br",
-        "seletores": {
-            "item": "li.ui-search-layout__item",
-            "nome": ".poly-component__title",
-            "preco": ".andes-money-amount__fraction",
-            "link": ".poly-component__title",
-            "avaliacao": "[class*='rating']",
-            "reviews": "[class*='review']"
-        },
-        "paginacao": "_Desde_{}"
-    },
-    "2": {
-        "nome": "Amazon",
-        "base_url": "https://www.amazon.com.br/s?k=",
-        "seletores": {
-            "item": "[data-component-type='s-search-result']",
-            "nome": "h2 a span",
-            "preco": ".a-price-whole",
-            "link": "h2 a",
-            "avaliacao": ".a-icon-alt",
-            "reviews": ".a-size-base"
-        },
-        "paginacao": "&page={}"
-    }
+    "1": SITES["mercado_livre"],
+    "2": SITES["amazon"],
 }
 
 # ==========================
@@ -154,45 +134,27 @@ def coletar_produtos(site_config, url_base, termo_busca):
                 print(f"[ERRO] Não foi possível acessar a página (status {resp.status_code}).")
                 break
 
-            soup = BeautifulSoup(resp.text, "html.parser")
+            backend = escolher_backend(site_config['seletores'].values(), site_config.get('parser'))
+            soup = parse_html(resp.content, backend)
             itens = soup.select(site_config['seletores']['item'])
             
             if not itens:
                 print("[INFO] Não há mais produtos.")
                 break
 
-            for item in itens:
-                # Extrair dados usando os seletores do site
-                nome_elem = item.select_one(site_config['seletores']['nome'])
-                preco_elem = item.select_one(site_config['seletores']['preco'])
-                link_elem = item.select_one(site_config['seletores']['link'])
-                avaliacao_elem = item.select_one(site_config['seletores']['avaliacao'])
-                reviews_elem = item.select_one(site_config['seletores']['reviews'])
-
-                # Processar dados
-                nome = nome_elem.get_text(strip=True) if nome_elem else None
-                preco = preco_elem.get_text(strip=True) if preco_elem else None
-                
-                # Processar link
-                link = None
-                if link_elem:
-                    if link_elem.get('href'):
-                        link = link_elem['href']
-                        # Se for link relativo, adicionar domínio
-                        if link and link.startswith('/'):
-                            if site_config['nome'] == "Mercado Livre":
-                                link = f"https://www.mercadolivre.com.br{link}"
-                            elif site_config['nome'] == "Amazon":
-                                link = f"https://www.amazon.com.br{link}"
-
-                produtos.append({
-                    "nome": nome,
-                    "preco": preco,
-                    "link": link,
-                    "avaliacao": None,  # Para implementar futuramente
-                    "reviews": None,    # Para implementar futuramente
-                    "site": site_config['nome']
-                })
+            # Plano de extração compilado uma vez por site (todos os campos numa passada)
+            plano = plano_extracao(site_config['seletores'], site_config['nome'])
+            da_pagina = [dict(zip(CAMPOS, plano.extrair(item))) for item in itens]
+            # Preços numéricos da página (com os centavos de cada preço)
+            precos_num = normalizar_precos(
+                [p['preco'] for p in da_pagina],
+                [p.pop('centavos') for p in da_pagina],
+                locale_do_site(site_config['nome'])
+            )
+            for produto, preco_num in zip(da_pagina, precos_num):
+                produto["preco_num"] = None if preco_num != preco_num else float(preco_num)  # NaN -> None
+                produto["site"] = site_config['nome']
+                produtos.append(produto)
 
             pagina += 1
             time.sleep(DELAY)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+🚚 Benchmark de Ponta a Ponta (jobs/min e páginas/s)
+Sobe a loja local (servidor_loja.py), aponta os sites para ela com
+SCRAPER_SITES_BASE_URL e roda lotes de jobs pela API real (POST /scraping,
+fila, fetch, parse, normalização e gravação) em vários níveis de
+concorrência. Cada nível roda num processo novo, com as métricas zeradas.
+
+Por nível de concorrência N, o processo filho usa:
+  SCRAPER_WORKERS=N, SCRAPER_MAX_JOBS_PER_SITE=N  -> jobs simultâneos
+  SCRAPER_RATE=0                                  -> sem limite de taxa (a loja é local)
+  SCRAPER_CACHE=0                                 -> toda página vai à rede
+  SCRAPER_PROXIES=off                             -> conexão direta com a loja
+  SCRAPER_HUMAN_DELAY_FACTOR=--fator-espera       -> esperas "humanas" (0 = desligadas)
+
+Uso:
+  python -m benchmarks.bench_e2e --concorrencia 1,2,4,8 --jobs 16 --paginas 3
+  python -m benchmarks.bench_e2e --latencia-ms 300 --taxa-429 0.05 --json
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import argparse
+import subprocess
+import urllib.request
+from typing import Dict, List
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+STATUS_FINAIS = ('completed', 'failed', 'cancelled')
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(url: str, processo: subprocess.Popen, timeout: float = 20.0, nome: str = "Loja local"):
+    """Espera ``url`` responder; falha se o processo terminar antes"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"{nome} terminou na subida (código {processo.returncode})")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{nome} não respondeu a tempo")
+
+
+def _estado_loja(url: str) -> Dict:
+    with urllib.request.urlopen(f"{url}/__estado", timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def subir_loja(args, porta: int = 0) -> (subprocess.Popen, str):
+    """Sobe servidor_loja.py (opções da loja em ``args``) e devolve (processo, url base)"""
+    porta = porta or porta_livre()
+    comando = [
+        sys.executable, '-m', 'benchmarks.servidor_loja', '--porta', str(porta),
+        '--latencia-ms', str(args.latencia_ms), '--jitter-ms', str(args.jitter_ms),
+        '--taxa-403', str(args.taxa_403), '--taxa-429', str(args.taxa_429),
+        '--taxa-captcha', str(args.taxa_captcha), '--paginas', str(max(args.paginas, 1)),
+    ]
+    if args.tamanho:
+        comando += ['--tamanho', str(args.tamanho)]
+    if args.itens:
+        comando += ['--itens', str(args.itens)]
+    processo = subprocess.Popen(comando, cwd=RAIZ)
+    url = f"http://127.0.0.1:{porta}"
+    try:
+        esperar_servidor(f"{url}/__estado", processo)
+    except Exception:
+        processo.kill()
+        raise
+    return processo, url
+
+
+# ---------- Processo filho: roda um lote de jobs pela API ----------
+
+def _rodar_lote(args) -> Dict:
+    """Executa ``args.jobs`` jobs via TestClient e devolve throughput e contadores"""
+    from fastapi.testclient import TestClient
+    import api
+    from metrics_registry import PAGINAS_BAIXADAS, RESPOSTAS_HTTP, BLOQUEIOS, PRODUTOS_EXTRAIDOS, LATENCIA_FETCH
+
+    sites = [s.strip() for s in args.sites.split(',') if s.strip()]
+    with TestClient(api.app) as cliente:
+        inicio = time.perf_counter()
+        ids = []
+        for i in range(args.jobs):
+            resp = cliente.post('/scraping', json={
+                'site': sites[i % len(sites)], 'termo_busca': f"bench{args.rodada}x{i}",
+                'max_paginas': args.paginas, 'delay': args.delay,
+            })
+            resp.raise_for_status()
+            ids.append(resp.json()['job_id'])
+
+        finais: Dict[str, str] = {}
+        limite = time.monotonic() + args.timeout
+        while len(finais) < len(ids) and time.monotonic() < limite:
+            for job_id in ids:
+                if job_id not in finais:
+                    status = cliente.get(f'/job/{job_id}', params={'apenas_status': True}).json()['status']
+                    if status in STATUS_FINAIS:
+                        finais[job_id] = status
+            time.sleep(0.1)
+        duracao = time.perf_counter() - inicio
+
+        por_status: Dict[str, int] = {}
+        for job_id in ids:
+            status = finais.get(job_id, 'timeout')
+            por_status[status] = por_status.get(status, 0) + 1
+
+    paginas = sum(v for (site, origem), v in PAGINAS_BAIXADAS.valores().items() if origem == 'rede')
+    produtos = sum(PRODUTOS_EXTRAIDOS.valores().values())
+    fetch_n = sum(n for n, _ in LATENCIA_FETCH.resumo().values())
+    fetch_s = sum(s for _, s in LATENCIA_FETCH.resumo().values())
+    return {
+        'concorrencia': args.concorrencia_filho,
+        'jobs': len(ids),
+        'duracao_s': round(duracao, 3),
+        'jobs_por_min': round(por_status.get('completed', 0) / duracao * 60, 1),
+        'paginas': int(paginas),
+        'paginas_por_s': round(paginas / duracao, 2),
+        'produtos_por_s': round(produtos / duracao, 1),
+        'fetch_medio_ms': round(fetch_s / fetch_n * 1000, 1) if fetch_n else None,
+        'status_jobs': por_status,
+        'http': {f"{site} {status}": int(n) for (site, status), n in sorted(RESPOSTAS_HTTP.valores().items())},
+        'bloqueios': {f"{site} {motivo}": int(n) for (site, motivo), n in sorted(BLOQUEIOS.valores().items())},
+    }
+
+
+# ---------- Processo pai: loja + um filho por nível ----------
+
+def ambiente_jobs(url: str, pasta: str, concorrencia: int, fator_espera: float) -> Dict[str, str]:
+    """Ambiente de um processo da API apontado para a loja local em ``url``"""
+    env = dict(os.environ)
+    env.update({
+        'SCRAPER_SITES_BASE_URL': url,
+        'SCRAPER_WORKERS': str(concorrencia),
+        'SCRAPER_MAX_JOBS_PER_SITE': str(concorrencia),
+        'SCRAPER_DOMAIN_CONCURRENCY': str(max(4, concorrencia * 2)),
+        'SCRAPER_RATE': '0',
+        'SCRAPER_CACHE': '0',
+        'SCRAPER_HUMAN_DELAY_FACTOR': str(fator_espera),
+        'SCRAPER_JOBS_FILE': os.path.join(pasta, 'jobs.json'),
+        'SCRAPER_SESSION_PREWARM': '',
+        'SCRAPER_PROXIES': 'off',
+        'SCRAPER_TRACE_FILE': '',
+        'PYTHONPATH': os.pathsep.join(filter(None, [RAIZ, os.environ.get('PYTHONPATH')])),
+    })
+    return env
+
+
+def _rodar_nivel(args, url: str, concorrencia: int, rodada: int) -> Dict:
+    pasta = tempfile.mkdtemp(prefix='bench_e2e_')
+    env = ambiente_jobs(url, pasta, concorrencia, args.fator_espera)
+    comando = [
+        sys.executable, '-m', 'benchmarks.bench_e2e', '--filho',
+        '--concorrencia-filho', str(concorrencia), '--rodada', str(rodada),
+        '--jobs', str(args.jobs), '--paginas', str(args.paginas), '--delay', str(args.delay),
+        '--sites', args.sites, '--timeout', str(args.timeout),
+    ]
+    saida = subprocess.run(comando, cwd=pasta, env=env, capture_output=True, text=True,
+                           timeout=args.timeout + 60)
+    if saida.returncode != 0:
+        raise RuntimeError(f"Nível {concorrencia} falhou:\n{saida.stderr[-2000:]}")
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def _imprimir(resultados: List[Dict], loja: Dict):
+    print(f"{'conc':>4}  {'jobs':>4}  {'dur (s)':>8}  {'jobs/min':>8}  {'pág/s':>7}  "
+          f"{'prod/s':>7}  {'fetch ms':>8}  status")
+    for r in resultados:
+        status = ' '.join(f"{k}={v}" for k, v in sorted(r['status_jobs'].items()))
+        print(f"{r['concorrencia']:>4}  {r['jobs']:>4}  {r['duracao_s']:>8.2f}  {r['jobs_por_min']:>8.1f}  "
+              f"{r['paginas_por_s']:>7.2f}  {r['produtos_por_s']:>7.1f}  {r['fetch_medio_ms'] or 0:>8.1f}  {status}")
+        if r['bloqueios']:
+            print(f"      bloqueios: {r['bloqueios']}")
+    print(f"\nLoja local: {loja['requisicoes']} requisições, {loja['bytes_enviados'] / 1e6:.1f} MB, "
+          f"{loja['por_site_status']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra a loja local")
+    parser.add_argument('--concorrencia', default='1,2,4,8', help="níveis de jobs simultâneos")
+    parser.add_argument('--jobs', type=int, default=16, help="jobs por nível")
+    parser.add_argument('--paginas', type=int, default=3, help="max_paginas de cada job")
+    parser.add_argument('--delay', type=float, default=0.0, help="delay entre páginas do job")
+    parser.add_argument('--sites', default='mercado_livre,amazon,ebay')
+    parser.add_argument('--fator-espera', type=float, default=0.0,
+                        help="SCRAPER_HUMAN_DELAY_FACTOR dos jobs (0 desliga as esperas humanas)")
+    parser.add_argument('--timeout', type=float, default=300.0, help="tempo máximo por nível (s)")
+    parser.add_argument('--json', action='store_true', help="saída em JSON")
+    # Loja local
+    parser.add_argument('--porta', type=int, default=0, help="porta da loja (0 = livre)")
+    parser.add_argument('--latencia-ms', type=float, default=150.0)
+    parser.add_argument('--jitter-ms', type=float, default=50.0)
+    parser.add_argument('--tamanho', type=int, default=None)
+    parser.add_argument('--itens', type=int, default=None)
+    parser.add_argument('--taxa-403', type=float, default=0.0)
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--taxa-captcha', type=float, default=0.0)
+    # Uso interno (processo filho)
+    parser.add_argument('--filho', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--concorrencia-filho', type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument('--rodada', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.filho:
+        print(json.dumps(_rodar_lote(args)))
+        return 0
+
+    niveis = [int(n) for n in args.concorrencia.split(',') if n.strip()]
+    processo, url = subir_loja(args, args.porta)
+    try:
+        resultados = [_rodar_nivel(args, url, n, rodada) for rodada, n in enumerate(niveis)]
+        loja = _estado_loja(url)
+    finally:
+        processo.terminate()
+        processo.wait(timeout=10)
+
+    if args.json:
+        print(json.dumps({'resultados': resultados, 'loja': loja}, indent=2, ensure_ascii=False))
+    else:
+        _imprimir(resultados, loja)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
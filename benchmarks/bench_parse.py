@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark de Parsing/Extração (offline)
+Mede o caminho de CPU de cada página — detecção de bloqueio/captcha,
+parsing, seleção dos itens (com o fallback de SELETORES_ALTERNATIVOS),
+extração dos campos e normalização dos preços — sobre o corpus de fixtures
+em benchmarks/fixtures, para cada parser disponível.
+
+Informa ms por etapa, páginas/s e produtos/s da página completa e o pico de
+memória (heap Python via tracemalloc e RSS num processo filho), e compara
+com o baseline guardado: sai com código 1 se o corpus ficou mais lento que a
+tolerância para algum parser (etapas isoladas geram avisos; --estrito reprova
+por elas também).
+
+Uso:
+  python -m benchmarks.bench_parse                      # roda e compara com o baseline
+  python -m benchmarks.bench_parse --salvar-baseline    # grava o baseline desta máquina (não versionado)
+  python -m benchmarks.bench_parse --gerar-fixtures     # regenera o corpus sintético
+  python -m benchmarks.bench_parse --paginas-salvas '/tmp/scraping/job_*_pagina1.html'
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import multiprocessing
+from typing import Callable, Dict, List, Optional, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from block_detector import detector_bloqueio  # noqa: E402
+from page_parser import SELETORES_ALTERNATIVOS, extrair_pagina  # noqa: E402
+from parser_backends import BACKENDS, disponivel, escolher_backend, parse_html  # noqa: E402
+from price_normalizer import locale_do_site, normalizar_precos  # noqa: E402
+from sites import SITES_SUPORTADOS  # noqa: E402
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_FIXTURES = os.path.join(PASTA, 'fixtures')
+BASELINE_PADRAO = os.path.join(PASTA, 'baseline_parse.json')
+
+# deteccao_bloqueio: regex de bloqueio/captcha | parse: árvore completa no backend |
+# selecao: seletor de item (+ alternativos) na árvore pronta | extrair_pagina: o que roda no job
+# (parse por região + seleção + campos) | precos: normalização | pagina_completa: tudo junto
+ETAPAS = ('deteccao_bloqueio', 'parse', 'selecao', 'extrair_pagina', 'precos', 'pagina_completa')
+
+
+# ---------- Corpus ----------
+
+def gerar_fixtures(pasta: str = PASTA_FIXTURES) -> List[str]:
+    from benchmarks.paginas_sinteticas import corpus
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for nome, conteudo in corpus().items():
+        caminho = os.path.join(pasta, nome + '.gz')
+        # mtime fixo: o mesmo corpus gera os mesmos bytes
+        with open(caminho, 'wb') as f, gzip.GzipFile(filename=nome, mode='wb', fileobj=f, mtime=0) as gz:
+            gz.write(conteudo)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def _site_do_arquivo(nome: str, conteudo: bytes) -> str:
+    for site in SITES_SUPORTADOS:
+        if nome.startswith(site):
+            return site
+    # Páginas salvas pelos jobs: pelo domínio que aparece no HTML
+    baixo = conteudo[:200_000].lower()
+    for site, marca in (('amazon', b'amazon.com'), ('ebay', b'ebay.com'), ('mercado_livre', b'mercadoli')):
+        if marca in baixo:
+            return site
+    return 'mercado_livre'
+
+
+def carregar_corpus(pasta: str = PASTA_FIXTURES, extras: Optional[str] = None) -> List[Tuple[str, str, bytes]]:
+    """[(nome, site, bytes)] das fixtures (e das páginas salvas em ``extras``, um glob)"""
+    paginas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, '*.html.gz'))):
+        with gzip.open(caminho, 'rb') as f:
+            conteudo = f.read()
+        nome = os.path.basename(caminho)[:-3]
+        paginas.append((nome, _site_do_arquivo(nome, conteudo), conteudo))
+    for caminho in sorted(glob.glob(extras)) if extras else []:
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+        nome = 'salva/' + os.path.basename(caminho)
+        paginas.append((nome, _site_do_arquivo('', conteudo), conteudo))
+    return paginas
+
+
+# ---------- Medição ----------
+
+def medir_ms(funcao: Callable[[], object], repeticoes: int, tempo_min: float) -> float:
+    """Melhor rodada em ms por chamada; cada rodada repete a função até durar ``tempo_min`` s.
+
+    O mínimo (e não a média) é o menos afetado por ruído da máquina, que só deixa mais lento.
+    """
+    funcao()  # aquecimento (caches de seletores, imports preguiçosos)
+    n = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcao()
+        decorrido = time.perf_counter() - inicio
+        if decorrido >= tempo_min or n >= 1 << 16:
+            break
+        n *= 2
+    amostras = [decorrido / n]
+    for _ in range(repeticoes - 1):
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcao()
+        amostras.append((time.perf_counter() - inicio) / n)
+    return min(amostras) * 1000
+
+
+def calibrar(repeticoes: int = 5) -> float:
+    """ms de uma carga fixa de CPU (Python puro), para descontar a velocidade da máquina na comparação"""
+    def carga():
+        dados = [(i * 7919) % 10007 for i in range(20000)]
+        indice = {}
+        for i, v in enumerate(sorted(dados)):
+            indice.setdefault(v % 997, []).append(i)
+        return sum(len(v) for v in indice.values())
+    # Mais rodadas que as medições: o mínimo precisa pegar uma janela sem ruído
+    return medir_ms(carga, max(repeticoes, 15), 0.02)
+
+
+def _pagina_completa(conteudo: bytes, config: dict, parser: str):
+    """O que o job faz com cada página baixada (fora rede e gravação)"""
+    if detector_bloqueio.motivo(conteudo):
+        return None
+    resultado = extrair_pagina(conteudo, config['seletores'], config['nome'], parser)
+    normalizar_precos([p[1] for p in resultado.produtos], [p[5] for p in resultado.produtos],
+                      locale_do_site(config['nome']))
+    return resultado
+
+
+def _selecionar(arvore, config: dict) -> int:
+    itens = arvore.select(config['seletores']['item'])
+    if not itens:
+        for seletor in SELETORES_ALTERNATIVOS.get(config['nome'], []):
+            itens = arvore.select(seletor)
+            if itens:
+                break
+    return len(itens)
+
+
+def _pico_rss_kb(conteudo: bytes, config: dict, parser: str) -> Optional[int]:
+    """Pico de RSS (KB) acima do RSS inicial, medido num processo filho (só Linux)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    contexto = multiprocessing.get_context('fork')
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_filho_rss, args=(conteudo, config, parser, fila))
+    processo.start()
+    processo.join()
+    return fila.get() if not fila.empty() else None
+
+
+def _filho_rss(conteudo: bytes, config: dict, parser: str, fila):
+    import resource
+    with open('/proc/self/statm') as f:
+        inicial_kb = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    _pagina_completa(conteudo, config, parser)
+    fila.put(max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - inicial_kb))
+
+
+def medir_pagina(conteudo: bytes, site: str, parser: str, repeticoes: int, tempo_min: float,
+                 memoria: bool = True) -> Dict:
+    config = SITES_SUPORTADOS[site]
+    # O backend efetivo pode cair para bs4 se o parser não entender os seletores
+    backend = escolher_backend(list(config['seletores'].values()) + SELETORES_ALTERNATIVOS.get(config['nome'], []),
+                               parser)
+    resultado = extrair_pagina(conteudo, config['seletores'], config['nome'], parser)
+    precos = [p[1] for p in resultado.produtos]
+    centavos = [p[5] for p in resultado.produtos]
+    locale = locale_do_site(config['nome'])
+    arvore = parse_html(conteudo, backend)
+
+    medicoes = {
+        'deteccao_bloqueio': medir_ms(lambda: detector_bloqueio.motivo(conteudo), repeticoes, tempo_min),
+        'parse': medir_ms(lambda: parse_html(conteudo, backend), repeticoes, tempo_min),
+        'selecao': medir_ms(lambda: _selecionar(arvore, config), repeticoes, tempo_min),
+        'extrair_pagina': medir_ms(
+            lambda: extrair_pagina(conteudo, config['seletores'], config['nome'], parser), repeticoes, tempo_min),
+        'precos': medir_ms(lambda: normalizar_precos(precos, centavos, locale), repeticoes, tempo_min),
+        'pagina_completa': medir_ms(lambda: _pagina_completa(conteudo, config, parser), repeticoes, tempo_min),
+    }
+    saida = {
+        'site': site,
+        'backend': backend,
+        'bytes': len(conteudo),
+        'bloqueio': detector_bloqueio.motivo(conteudo),
+        'produtos': len(resultado.produtos),
+        'fallback': resultado.fallback_usado,
+        'ms': {etapa: round(ms, 4) for etapa, ms in medicoes.items()},
+    }
+    ms_pagina = medicoes['pagina_completa'] / 1000
+    saida['paginas_s'] = round(1 / ms_pagina, 1) if ms_pagina else None
+    saida['produtos_s'] = round(len(resultado.produtos) / ms_pagina, 1) if ms_pagina else None
+
+    if memoria:
+        tracemalloc.start()
+        _pagina_completa(conteudo, config, parser)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        saida['pico_python_kb'] = pico // 1024
+        saida['pico_rss_kb'] = _pico_rss_kb(conteudo, config, parser)
+    return saida
+
+
+def rodar(paginas: List[Tuple[str, str, bytes]], parsers: List[str], repeticoes: int, tempo_min: float,
+          memoria: bool = True, saida=sys.stdout) -> Dict:
+    calibracao = calibrar(repeticoes)
+    resultados: Dict[str, Dict[str, Dict]] = {}
+    for nome, site, conteudo in paginas:
+        for parser in parsers:
+            r = medir_pagina(conteudo, site, parser, repeticoes, tempo_min, memoria)
+            resultados.setdefault(nome, {})[parser] = r
+            print(f"{nome:42s} {parser:10s} {r['ms']['pagina_completa']:8.2f} ms/pág "
+                  f"{r['paginas_s'] or 0:8.1f} pág/s {r['produtos_s'] or 0:9.1f} prod/s "
+                  f"({r['produtos']} produtos, parse {r['ms']['parse']:.2f} ms, "
+                  f"extrair_pagina {r['ms']['extrair_pagina']:.2f} ms, RSS +{r.get('pico_rss_kb') or 0} KB)", file=saida)
+
+    # Totais por parser: corpus inteiro processado uma vez
+    totais = {}
+    for parser in parsers:
+        ms = sum(r[parser]['ms']['pagina_completa'] for r in resultados.values())
+        produtos = sum(r[parser]['produtos'] for r in resultados.values())
+        totais[parser] = {
+            'paginas': len(resultados),
+            'ms_total': round(ms, 3),
+            'paginas_s': round(len(resultados) / (ms / 1000), 1) if ms else None,
+            'produtos_s': round(produtos / (ms / 1000), 1) if ms else None,
+        }
+    # Recalibra no fim: vale a melhor medida (a máquina pode ter ficado ocupada no meio)
+    calibracao = min(calibracao, calibrar(repeticoes))
+    return {
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'maquina': platform.node(),
+            'calibracao_ms': round(calibracao, 4),
+        },
+        'resultados': resultados,
+        'totais': totais,
+    }
+
+
+# ---------- Baseline ----------
+
+def comparar(atual: Dict, baseline: Dict, tolerancia: float) -> Tuple[List[str], List[str]]:
+    """(regressões, avisos) em relação ao baseline.
+
+    Regressão: tempo do corpus inteiro de um parser acima de ``baseline * (1 + tolerancia)``.
+    Aviso: o mesmo para uma etapa de uma página (mais sujeito a ruído, não reprova sozinho).
+    O baseline é escalado pela razão entre as calibrações, o que compensa a carga
+    da máquina entre as duas rodadas; baseline de outra máquina não é comparável.
+    """
+    escala = 1.0
+    cal_atual = atual['ambiente'].get('calibracao_ms')
+    cal_base = baseline.get('ambiente', {}).get('calibracao_ms')
+    if cal_atual and cal_base:
+        escala = cal_atual / cal_base
+
+    def _piorou(antes: Optional[float], agora: Optional[float]) -> bool:
+        return bool(antes and agora and agora > antes * escala * (1 + tolerancia))
+
+    def _linha(rotulo: str, antes: float, agora: float) -> str:
+        return f"{rotulo}: {antes * escala:.3f} ms -> {agora:.3f} ms (+{(agora / (antes * escala) - 1) * 100:.0f}%)"
+
+    regressoes = []
+    for parser, total in atual['totais'].items():
+        base = baseline.get('totais', {}).get(parser)
+        # Só compara o total se o corpus é o mesmo
+        if base and base.get('paginas') == total['paginas'] and _piorou(base['ms_total'], total['ms_total']):
+            regressoes.append(_linha(f"corpus [{parser}]", base['ms_total'], total['ms_total']))
+
+    avisos = []
+    for nome, por_parser in atual['resultados'].items():
+        for parser, r in por_parser.items():
+            base = baseline.get('resultados', {}).get(nome, {}).get(parser)
+            if not base:
+                continue
+            for etapa in ETAPAS:
+                antes, agora = base['ms'].get(etapa), r['ms'].get(etapa)
+                if _piorou(antes, agora):
+                    avisos.append(_linha(f"{nome} [{parser}] {etapa}", antes, agora))
+    return regressoes, avisos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline de parsing/extração")
+    parser.add_argument('--parsers', default=','.join(BACKENDS),
+                        help="parsers a medir (padrão: todos os disponíveis)")
+    parser.add_argument('--repeticoes', type=int, default=5, help="rodadas por medição (vale a melhor)")
+    parser.add_argument('--tempo-min', type=float, default=0.05, help="duração mínima de cada rodada (s)")
+    parser.add_argument('--filtro', default='', help="só fixtures cujo nome contém este texto")
+    parser.add_argument('--paginas-salvas', default=None,
+                        help="glob de páginas salvas pelos jobs (ex: '/tmp/scraping/job_*_pagina1.html')")
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--tolerancia', type=float, default=0.30, help="regressão aceita (0.30 = 30%%)")
+    parser.add_argument('--estrito', action='store_true', help="reprova também por etapa de página")
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--gerar-fixtures', action='store_true')
+    parser.add_argument('--sem-memoria', action='store_true', help="pula as medições de memória")
+    parser.add_argument('--json', default=None, help="grava o resultado completo neste arquivo")
+    args = parser.parse_args(argv)
+
+    if args.gerar_fixtures:
+        for caminho in gerar_fixtures():
+            print(f"📄 {os.path.relpath(caminho, RAIZ)} ({os.path.getsize(caminho)} bytes)")
+        return 0
+
+    parsers = [p for p in args.parsers.split(',') if p and disponivel(p)]
+    paginas = [p for p in carregar_corpus(extras=args.paginas_salvas) if args.filtro in p[0]]
+    if not paginas:
+        print("Nenhuma fixture encontrada (rode com --gerar-fixtures)")
+        return 2
+
+    atual = rodar(paginas, parsers, args.repeticoes, args.tempo_min, memoria=not args.sem_memoria)
+    print()
+    for p, t in atual['totais'].items():
+        print(f"📊 {p:10s} {t['paginas_s']} pág/s  {t['produtos_s']} produtos/s  ({t['paginas']} páginas)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, ensure_ascii=False, indent=2)
+
+    if args.salvar_baseline:
+        # Páginas salvas localmente não entram no baseline (não são reprodutíveis)
+        atual['resultados'] = {n: r for n, r in atual['resultados'].items() if not n.startswith('salva/')}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n💾 Baseline gravado em {os.path.relpath(args.baseline, RAIZ)}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nSem baseline para comparar (rode com --salvar-baseline)")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressoes, avisos = comparar(atual, baseline, args.tolerancia)
+    if avisos:
+        print(f"\n⚠️ Etapas mais lentas que o baseline (+{args.tolerancia:.0%}):")
+        for linha in avisos:
+            print(f"  - {linha}")
+    if args.estrito:
+        regressoes += avisos
+    if regressoes:
+        print(f"\n🐢 {len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%} em relação ao baseline:")
+        for linha in regressoes:
+            print(f"  - {linha}")
+        return 1
+    print(f"\n✅ Sem regressões acima de {args.tolerancia:.0%} em relação ao baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
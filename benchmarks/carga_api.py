@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+📈 Teste de Carga da API (submissão e polling de jobs)
+Simula N clientes da interface web seguindo o fluxo do static/script.js:
+GET /sites, POST /scraping, GET /job/{id}?since=<cursor> a cada 2 s até o
+status final e GET /job/{id}/download quando o job completa.
+
+Por padrão sobe a loja local (servidor_loja.py) como backend falso e uma
+instância da API via main.py (uvicorn, um processo) apontada para ela.
+Mede latência p50/p95/p99 por endpoint, taxa de erro e, lendo /proc, CPU e
+RSS do servidor ao longo do tempo (Linux).
+
+Uso:
+  python -m benchmarks.carga_api --clientes 50 --duracao 60
+  python -m benchmarks.carga_api --clientes 200 --rampa 30 --paginas 3 --delay 0.5
+  python -m benchmarks.carga_api --url http://127.0.0.1:8000 --pid 12345   # servidor já no ar
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from benchmarks.bench_e2e import ambiente_jobs, esperar_servidor, porta_livre, subir_loja  # noqa: E402
+
+STATUS_FINAIS = ('completed', 'failed', 'cancelled', 'error')
+INTERVALO_POLLING = 2.0  # setInterval(checkJobStatus, 2000) do script.js
+
+
+def percentil(valores: List[float], p: float) -> Optional[float]:
+    """Percentil por posição mais próxima (valores já ordenados)"""
+    if not valores:
+        return None
+    indice = max(0, min(len(valores) - 1, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+class Coletor:
+    """Latências e erros por endpoint, com série temporal em janelas"""
+
+    def __init__(self, inicio: float, janela: float):
+        self.inicio = inicio
+        self.janela = janela
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # janela -> endpoint -> [latências], e janela -> erros
+        self.por_janela: Dict[int, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        self.erros_janela: Dict[int, int] = defaultdict(int)
+        self.jobs: Dict[str, int] = defaultdict(int)
+
+    def registrar(self, endpoint: str, segundos: float, erro: Optional[str] = None):
+        janela = int((time.monotonic() - self.inicio) // self.janela)
+        self.latencias[endpoint].append(segundos)
+        self.por_janela[janela][endpoint].append(segundos)
+        if erro:
+            self.erros[endpoint][erro] += 1
+            self.erros_janela[janela] += 1
+
+    def resumo_endpoints(self) -> Dict[str, Dict]:
+        resumo = {}
+        for endpoint, valores in sorted(self.latencias.items()):
+            ordenados = sorted(valores)
+            n_erros = sum(self.erros[endpoint].values())
+            resumo[endpoint] = {
+                'n': len(ordenados),
+                'erros': n_erros,
+                'taxa_erro': round(n_erros / len(ordenados), 4),
+                'p50_ms': round(percentil(ordenados, 50) * 1000, 1),
+                'p95_ms': round(percentil(ordenados, 95) * 1000, 1),
+                'p99_ms': round(percentil(ordenados, 99) * 1000, 1),
+                'max_ms': round(ordenados[-1] * 1000, 1),
+                'tipos_erro': dict(self.erros[endpoint]),
+            }
+        return resumo
+
+
+class AmostradorProcesso:
+    """CPU (%) e RSS (MB) de um processo a partir de /proc/<pid> (Linux)"""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf('SC_CLK_TCK')
+        self.disponivel = os.path.exists(f"/proc/{pid}/stat")
+        self._anterior: Optional[Tuple[float, float]] = None
+
+    def _cpu_s(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # O nome do processo (campo 2) pode ter espaços: os campos seguem o último ')'
+            campos = f.read().rsplit(')', 1)[1].split()
+        return (int(campos[11]) + int(campos[12])) / self.ticks  # utime + stime
+
+    def _rss_mb(self) -> float:
+        with open(f"/proc/{self.pid}/status") as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) / 1024
+        return 0.0
+
+    def amostra(self) -> Optional[Tuple[float, float]]:
+        """(cpu %, rss MB) desde a amostra anterior; None na primeira chamada ou sem /proc"""
+        if not self.disponivel:
+            return None
+        try:
+            agora, cpu = time.monotonic(), self._cpu_s()
+            rss = self._rss_mb()
+        except (OSError, IndexError, ValueError):
+            self.disponivel = False
+            return None
+        anterior, self._anterior = self._anterior, (agora, cpu)
+        if anterior is None:
+            return None
+        return round((cpu - anterior[1]) / max(agora - anterior[0], 1e-6) * 100, 1), round(rss, 1)
+
+
+# ---------- Cliente simulado ----------
+
+async def _pedir(http: httpx.AsyncClient, coletor: Coletor, endpoint: str, metodo: str, caminho: str,
+                 **kwargs) -> Optional[httpx.Response]:
+    inicio = time.perf_counter()
+    try:
+        resp = await http.request(metodo, caminho, **kwargs)
+        await resp.aread()
+    except httpx.TimeoutException:
+        coletor.registrar(endpoint, time.perf_counter() - inicio, 'timeout')
+        return None
+    except httpx.HTTPError as e:
+        coletor.registrar(endpoint, time.perf_counter() - inicio, type(e).__name__)
+        return None
+    coletor.registrar(endpoint, time.perf_counter() - inicio, str(resp.status_code) if resp.status_code >= 400 else None)
+    return resp
+
+
+async def _cliente(numero: int, http: httpx.AsyncClient, coletor: Coletor, args, fim: float):
+    """Um usuário da interface: abre a página e faz buscas em sequência até ``fim``"""
+    await asyncio.sleep(args.rampa * numero / max(args.clientes, 1))
+    sites = [s.strip() for s in args.sites.split(',') if s.strip()]
+    await _pedir(http, coletor, 'GET /sites', 'GET', '/sites')
+    iteracao = 0
+    while time.monotonic() < fim:
+        corpo = {'site': sites[(numero + iteracao) % len(sites)],
+                 'termo_busca': args.termo or f"carga{numero}x{iteracao}"}
+        # O script.js só envia site e termo; max_paginas/delay ficam no padrão da API
+        if args.paginas is not None:
+            corpo['max_paginas'] = args.paginas
+        if args.delay is not None:
+            corpo['delay'] = args.delay
+        iteracao += 1
+        resp = await _pedir(http, coletor, 'POST /scraping', 'POST', '/scraping', json=corpo)
+        if resp is None or resp.status_code != 200:
+            coletor.jobs['nao_submetido'] += 1
+            await asyncio.sleep(INTERVALO_POLLING)
+            continue
+        job_id = resp.json()['job_id']
+
+        cursor = 0
+        status = None
+        proximo = time.monotonic()
+        while time.monotonic() < fim:
+            resp = await _pedir(http, coletor, 'GET /job/{id}', 'GET', f'/job/{job_id}', params={'since': cursor})
+            if resp is not None and resp.status_code == 200:
+                dados = resp.json()
+                if dados.get('produtos') is not None and dados.get('offset') == cursor:
+                    cursor = dados.get('cursor') or cursor
+                if dados['status'] in STATUS_FINAIS:
+                    status = dados['status']
+                    break
+            # Cadência fixa de 2 s (como o setInterval), descontando o tempo da resposta
+            proximo += INTERVALO_POLLING
+            await asyncio.sleep(max(0.0, proximo - time.monotonic()))
+
+        coletor.jobs[status or 'em_andamento'] += 1
+        if status == 'completed':
+            await _pedir(http, coletor, 'GET /job/{id}/download', 'GET', f'/job/{job_id}/download')
+        if args.pausa:
+            await asyncio.sleep(random.uniform(0, 2 * args.pausa))
+
+
+async def _amostrar(amostrador: Optional[AmostradorProcesso], coletor: Coletor, serie: List[Dict], fim: float):
+    """CPU/RSS do servidor a cada segundo (até ``fim``)"""
+    if amostrador is None:
+        return
+    amostrador.amostra()
+    while time.monotonic() < fim:
+        await asyncio.sleep(1.0)
+        valores = amostrador.amostra()
+        if valores is not None:
+            serie.append({'t': round(time.monotonic() - coletor.inicio, 1), 'cpu_pct': valores[0],
+                          'rss_mb': valores[1]})
+
+
+async def rodar_carga(url: str, args, pid: Optional[int]) -> Dict:
+    inicio = time.monotonic()
+    fim = inicio + args.duracao
+    coletor = Coletor(inicio, args.janela)
+    amostrador = AmostradorProcesso(pid) if pid else None
+    serie: List[Dict] = []
+    limites = httpx.Limits(max_connections=args.clientes * 2, max_keepalive_connections=args.clientes * 2)
+    cpu_cliente = os.times()
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limites) as http:
+        await asyncio.gather(
+            _amostrar(amostrador, coletor, serie, fim + 1),
+            *(_cliente(i, http, coletor, args, fim) for i in range(args.clientes)),
+        )
+    cpu_cliente = (os.times().user - cpu_cliente.user) + (os.times().system - cpu_cliente.system)
+    duracao = time.monotonic() - inicio
+    return {
+        'clientes': args.clientes,
+        'duracao_s': round(duracao, 1),
+        'requisicoes': sum(len(v) for v in coletor.latencias.values()),
+        'req_por_s': round(sum(len(v) for v in coletor.latencias.values()) / duracao, 1),
+        'jobs': dict(coletor.jobs),
+        'endpoints': coletor.resumo_endpoints(),
+        'janelas': _resumo_janelas(coletor, serie),
+        'servidor': _resumo_servidor(serie, amostrador),
+        'cpu_gerador_pct': round(cpu_cliente / duracao * 100, 1),
+    }
+
+
+def _resumo_janelas(coletor: Coletor, serie: List[Dict]) -> List[Dict]:
+    janelas = []
+    for janela in sorted(coletor.por_janela):
+        por_endpoint = coletor.por_janela[janela]
+        polls = sorted(por_endpoint.get('GET /job/{id}', []))
+        submits = sorted(por_endpoint.get('POST /scraping', []))
+        t0, t1 = janela * coletor.janela, (janela + 1) * coletor.janela
+        amostras = [a for a in serie if t0 < a['t'] <= t1]
+        total = sum(len(v) for v in por_endpoint.values())
+        janelas.append({
+            't': round(t1, 1),
+            'req_por_s': round(total / coletor.janela, 1),
+            'erros': coletor.erros_janela.get(janela, 0),
+            'poll_p95_ms': round(percentil(polls, 95) * 1000, 1) if polls else None,
+            'submit_p95_ms': round(percentil(submits, 95) * 1000, 1) if submits else None,
+            'cpu_pct': round(sum(a['cpu_pct'] for a in amostras) / len(amostras), 1) if amostras else None,
+            'rss_mb': max(a['rss_mb'] for a in amostras) if amostras else None,
+        })
+    return janelas
+
+
+def _resumo_servidor(serie: List[Dict], amostrador: Optional[AmostradorProcesso]) -> Optional[Dict]:
+    if not serie:
+        if amostrador is not None and not amostrador.disponivel:
+            print("⚠️ /proc indisponível: CPU/RSS do servidor não medidos", file=sys.stderr)
+        return None
+    cpus = sorted(a['cpu_pct'] for a in serie)
+    return {
+        'cpu_medio_pct': round(sum(cpus) / len(cpus), 1),
+        'cpu_p95_pct': percentil(cpus, 95),
+        'rss_inicial_mb': serie[0]['rss_mb'],
+        'rss_max_mb': max(a['rss_mb'] for a in serie),
+        'rss_final_mb': serie[-1]['rss_mb'],
+    }
+
+
+# ---------- Servidor local (loja + API via main.py) ----------
+
+def subir_api(url_loja: str, args) -> Tuple[subprocess.Popen, str, str]:
+    """Sobe main.py apontado para a loja; devolve (processo, url, arquivo de log)"""
+    pasta = tempfile.mkdtemp(prefix='carga_api_')
+    porta = porta_livre()
+    env = ambiente_jobs(url_loja, pasta, args.workers, args.fator_espera)
+    env.update({'PORT': str(porta), 'HOST': '127.0.0.1'})
+    log = os.path.join(pasta, 'servidor.log')
+    with open(log, 'wb') as saida:
+        processo = subprocess.Popen([sys.executable, 'main.py'], cwd=RAIZ, env=env,
+                                    stdout=saida, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{porta}"
+    try:
+        esperar_servidor(f"{url}/healthz", processo, timeout=60, nome="API")
+    except Exception:
+        processo.kill()
+        raise
+    return processo, url, log
+
+
+def _imprimir(resultado: Dict):
+    print(f"{resultado['clientes']} clientes, {resultado['duracao_s']} s, {resultado['requisicoes']} requisições "
+          f"({resultado['req_por_s']}/s); jobs: {resultado['jobs']}\n")
+    print(f"{'endpoint':<24} {'n':>6} {'erro %':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint, r in resultado['endpoints'].items():
+        print(f"{endpoint:<24} {r['n']:>6} {r['taxa_erro'] * 100:>7.2f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}" + (f"  {r['tipos_erro']}" if r['tipos_erro'] else ''))
+
+    def _fmt(valor, largura):
+        return f"{valor:>{largura}}" if valor is not None else f"{'-':>{largura}}"
+
+    print(f"\n{'t (s)':>6} {'req/s':>7} {'erros':>6} {'poll p95':>9} {'submit p95':>11} {'CPU %':>7} {'RSS MB':>8}")
+    for j in resultado['janelas']:
+        print(f"{j['t']:>6} {j['req_por_s']:>7} {j['erros']:>6} {_fmt(j['poll_p95_ms'], 9)} "
+              f"{_fmt(j['submit_p95_ms'], 11)} {_fmt(j['cpu_pct'], 7)} {_fmt(j['rss_mb'], 8)}")
+    servidor = resultado['servidor']
+    if servidor:
+        print(f"\nServidor: CPU média {servidor['cpu_medio_pct']}% (p95 {servidor['cpu_p95_pct']}%), "
+              f"RSS {servidor['rss_inicial_mb']} -> {servidor['rss_max_mb']} MB (máx)")
+    print(f"Gerador de carga: CPU {resultado['cpu_gerador_pct']}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga da API com clientes da interface web")
+    parser.add_argument('--clientes', type=int, default=20, help="usuários simultâneos")
+    parser.add_argument('--duracao', type=float, default=60.0, help="duração da carga (s)")
+    parser.add_argument('--rampa', type=float, default=10.0, help="tempo para todos os clientes entrarem (s)")
+    parser.add_argument('--pausa', type=float, default=1.0, help="pausa média entre buscas de um cliente (s)")
+    parser.add_argument('--sites', default='mercado_livre,amazon,ebay')
+    parser.add_argument('--termo', default=None, help="termo fixo (padrão: um termo por busca)")
+    parser.add_argument('--paginas', type=int, default=None, help="max_paginas (padrão: o da API, como o script.js)")
+    parser.add_argument('--delay', type=float, default=None, help="delay entre páginas (padrão: o da API)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="timeout de cada requisição (s)")
+    parser.add_argument('--janela', type=float, default=5.0, help="tamanho das janelas da série temporal (s)")
+    parser.add_argument('--json', action='store_true', help="saída em JSON")
+    # Servidor já no ar (sem loja local)
+    parser.add_argument('--url', default=None, help="API já no ar (não sobe loja nem main.py)")
+    parser.add_argument('--pid', type=int, default=None, help="PID do servidor para medir CPU/RSS com --url")
+    # Servidor local
+    parser.add_argument('--workers', type=int, default=4, help="SCRAPER_WORKERS da API local")
+    parser.add_argument('--fator-espera', type=float, default=0.0, help="SCRAPER_HUMAN_DELAY_FACTOR da API local")
+    parser.add_argument('--latencia-ms', type=float, default=150.0)
+    parser.add_argument('--jitter-ms', type=float, default=50.0)
+    parser.add_argument('--tamanho', type=int, default=None)
+    parser.add_argument('--itens', type=int, default=None)
+    parser.add_argument('--taxa-403', type=float, default=0.0)
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--taxa-captcha', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        resultado = asyncio.run(rodar_carga(args.url.rstrip('/'), args, args.pid))
+    else:
+        loja_args = argparse.Namespace(**vars(args))
+        loja_args.paginas = max(args.paginas or 10, 1)  # 10 = max_paginas padrão da API
+        loja, url_loja = subir_loja(loja_args)
+        try:
+            api, url, log = subir_api(url_loja, args)
+            try:
+                resultado = asyncio.run(rodar_carga(url, args, api.pid))
+            finally:
+                api.terminate()
+                try:
+                    api.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    api.kill()
+            resultado['log_servidor'] = log
+        finally:
+            loja.terminate()
+            loja.wait(timeout=10)
+
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    else:
+        _imprimir(resultado)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+🧪 Páginas Sintéticas de Resultado
+Gera páginas de busca no formato do Mercado Livre, Amazon e eBay que casam
+com os seletores de SITES_SUPORTADOS, com o "ruído" que as páginas reais têm
+(scripts com estado JSON, menus, filtros, rodapé) para chegar a um tamanho
+realista. A geração é determinística (semente), então o mesmo pedido sempre
+produz os mesmos bytes.
+
+Usada para gerar o corpus de fixtures dos benchmarks de parsing e pelo
+servidor local que imita as lojas.
+"""
+
+import json
+import random
+from html import escape
+from typing import Callable, Dict, Optional, Tuple
+
+
+MODELOS = ['Notebook Gamer', 'Notebook Ultrafino', 'Notebook 2 em 1', 'Notebook Empresarial', 'Chromebook']
+MARCAS = ['Lenovo', 'Dell', 'Acer', 'Asus', 'Samsung', 'HP', 'Positivo', 'Apple']
+DETALHES = ['Intel Core i5', 'Intel Core i7', 'Ryzen 5', 'Ryzen 7', '8GB RAM', '16GB RAM',
+            'SSD 256GB', 'SSD 512GB', 'Tela 15,6"', 'Tela 14"', 'Windows 11', 'Linux']
+
+
+def _titulo(rnd: random.Random, termo: str) -> str:
+    detalhes = ' '.join(rnd.sample(DETALHES, 3))
+    return f"{rnd.choice(MODELOS)} {rnd.choice(MARCAS)} {detalhes} - {termo}"
+
+
+def _ruido(rnd: random.Random, tamanho: int) -> str:
+    """Blocos de menu/filtros/recomendações até ~``tamanho`` bytes"""
+    partes = []
+    total = 0
+    i = 0
+    while total < tamanho:
+        itens = ''.join(
+            f'<li class="nav-item nav-item--{j}"><a href="/categoria/{i}-{j}" class="nav-link">'
+            f'<span class="nav-label">{escape(rnd.choice(MARCAS))} {rnd.randint(1, 999)}</span></a></li>'
+            for j in range(12)
+        )
+        bloco = f'<div class="ui-filter-group" data-id="f{i}"><h3 class="ui-filter-title">Filtro {i}</h3><ul>{itens}</ul></div>'
+        partes.append(bloco)
+        total += len(bloco)
+        i += 1
+    return ''.join(partes)
+
+
+def _estado_json(rnd: random.Random, tamanho: int) -> str:
+    """Script com estado inicial em JSON (as páginas reais carregam centenas de KB assim)"""
+    registros = []
+    total = 0
+    while total < tamanho:
+        registro = {'id': rnd.randint(10 ** 8, 10 ** 9), 'tracking': rnd.getrandbits(64),
+                    'attrs': [rnd.choice(DETALHES) for _ in range(4)]}
+        registros.append(registro)
+        total += 90
+    return f'<script type="application/json" id="__PRELOADED_STATE__">{json.dumps({"results": registros})}</script>'
+
+
+def _documento(titulo: str, ruido_inicio: str, corpo: str, ruido_fim: str, estado: str) -> bytes:
+    return (
+        '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+        f'<title>{escape(titulo)}</title>'
+        '<link rel="stylesheet" href="/static/app.css"></head><body>'
+        f'<header class="nav-header">{ruido_inicio}</header>'
+        f'<main class="results">{corpo}</main>'
+        f'<footer class="nav-footer">{ruido_fim}</footer>'
+        f'{estado}</body></html>'
+    ).encode('utf-8')
+
+
+def _montar(titulo: str, itens: str, rnd: random.Random, tamanho: int) -> bytes:
+    # Sobra do tamanho alvo: metade em DOM (filtros/menus), metade em JSON de estado
+    sobra = max(0, tamanho - len(itens))
+    return _documento(titulo, _ruido(rnd, sobra // 4), itens, _ruido(rnd, sobra // 4), _estado_json(rnd, sobra // 2))
+
+
+def _preco_brl(rnd: random.Random) -> Tuple[str, str]:
+    reais = rnd.randint(899, 15999)
+    return f"{reais:,}".replace(',', '.'), f"{rnd.randint(0, 99):02d}"
+
+
+# ---------- Layouts por site ----------
+
+def pagina_mercado_livre(termo: str = 'notebook', pagina: int = 1, itens: int = 50,
+                         tamanho: int = 400_000, semente: int = 0, alternativo: bool = False) -> bytes:
+    """Resultados do ML; ``alternativo`` usa só div.poly-card (força o fallback de seletores)"""
+    rnd = random.Random(f"ml-{termo}-{pagina}-{semente}")
+    blocos = []
+    for i in range(itens):
+        fracao, centavos = _preco_brl(rnd)
+        cents = f'<span class="andes-money-amount__cents">{centavos}</span>' if rnd.random() < 0.6 else ''
+        card = (
+            '<div class="poly-card poly-card--grid"><div class="poly-card__content">'
+            f'<a class="poly-component__title" href="/MLB-{rnd.randint(10**9, 10**10)}-notebook">{escape(_titulo(rnd, termo))}</a>'
+            '<div class="poly-component__price"><span class="andes-money-amount">'
+            f'<span class="andes-money-amount__currency-symbol">R$</span>'
+            f'<span class="andes-money-amount__fraction">{fracao}</span>{cents}</span></div>'
+            f'<span class="poly-reviews__rating">4.{rnd.randint(0, 9)}</span>'
+            f'<span class="poly-reviews__total">({rnd.randint(1, 5000)})</span>'
+            '</div></div>'
+        )
+        blocos.append(card if alternativo else f'<li class="ui-search-layout__item">{card}</li>')
+    lista = ''.join(blocos) if alternativo else f'<ol class="ui-search-layout">{"".join(blocos)}</ol>'
+    return _montar(f"{termo.title()} | Mercado Livre", lista, rnd, tamanho)
+
+
+def pagina_amazon(termo: str = 'notebook', pagina: int = 1, itens: int = 48,
+                  tamanho: int = 500_000, semente: int = 0) -> bytes:
+    rnd = random.Random(f"amazon-{termo}-{pagina}-{semente}")
+    blocos = []
+    for i in range(itens):
+        inteiro, fracao = _preco_brl(rnd)
+        blocos.append(
+            f'<div data-component-type="s-search-result" data-asin="B0{rnd.randint(10**7, 10**8)}" class="s-result-item">'
+            f'<h2 class="a-size-mini"><a class="a-link-normal" href="/dp/B0{rnd.randint(10**7, 10**8)}">'
+            f'<span class="a-text-normal">{escape(_titulo(rnd, termo))}</span></a></h2>'
+            f'<span class="a-icon-alt">{rnd.randint(3, 4)},{rnd.randint(0, 9)} de 5 estrelas</span>'
+            f'<span class="a-size-base">{rnd.randint(1, 9999)}</span>'
+            f'<span class="a-price"><span class="a-price-symbol">R$</span>'
+            f'<span class="a-price-whole">{inteiro},</span><span class="a-price-fraction">{fracao}</span></span>'
+            '</div>'
+        )
+    return _montar(f"Amazon.com.br : {termo}", f'<div class="s-main-slot">{"".join(blocos)}</div>', rnd, tamanho)
+
+
+def pagina_ebay(termo: str = 'notebook', pagina: int = 1, itens: int = 60,
+                tamanho: int = 350_000, semente: int = 0) -> bytes:
+    rnd = random.Random(f"ebay-{termo}-{pagina}-{semente}")
+    # O eBay real começa com um item "fantasma" sem preço
+    blocos = ['<li class="s-item s-item--placeholder"><div class="s-item__title">Shop on eBay</div></li>']
+    for i in range(itens):
+        dolares = rnd.randint(150, 3000)
+        blocos.append(
+            '<li class="s-item s-item__pl-on-bottom"><div class="s-item__info">'
+            f'<a class="s-item__link" href="https://www.ebay.com/itm/{rnd.randint(10**11, 10**12)}">'
+            f'<div class="s-item__title"><span role="heading">{escape(_titulo(rnd, termo))}</span></div></a>'
+            f'<span class="s-item__price">${dolares:,}.{rnd.randint(0, 99):02d}</span>'
+            f'<div class="x-star-rating"><span class="clipped">{rnd.randint(3, 4)}.{rnd.randint(0, 9)} out of 5 stars.</span></div>'
+            f'<span class="s-item__reviews-count"><span>{rnd.randint(1, 900)} product ratings</span></span>'
+            '</div></li>'
+        )
+    return _montar(f"{termo} | eBay", f'<ul class="srp-results">{"".join(blocos)}</ul>', rnd, tamanho)
+
+
+def pagina_captcha(site: str = 'mercado_livre') -> bytes:
+    """Página de desafio curta, como a que os sites devolvem ao bloquear"""
+    return (
+        '<!DOCTYPE html><html><head><title>Verificação</title></head><body>'
+        '<div class="challenge"><h1>Confirme que você não é um robô</h1>'
+        f'<form action="/captcha/{escape(site)}"><div class="g-recaptcha" data-sitekey="x"></div></form>'
+        '</div></body></html>'
+    ).encode('utf-8')
+
+
+def pagina_vazia(termo: str = 'notebook') -> bytes:
+    """Página sem resultados (fim da paginação); grande o bastante para não parecer bloqueio"""
+    rnd = random.Random(f"vazia-{termo}")
+    return _montar(f"{termo} - sem resultados", '<div class="ui-search-rescue">Não há anúncios que coincidam.</div>',
+                   rnd, 80_000)
+
+
+GERADORES: Dict[str, Callable[..., bytes]] = {
+    'mercado_livre': pagina_mercado_livre,
+    'amazon': pagina_amazon,
+    'ebay': pagina_ebay,
+}
+
+
+def pagina(site: str, termo: str = 'notebook', pagina: int = 1, tamanho: Optional[int] = None,
+           itens: Optional[int] = None, semente: int = 0) -> bytes:
+    """Página de resultados do ``site`` (tamanho e número de itens opcionais)"""
+    kwargs = {'termo': termo, 'pagina': pagina, 'semente': semente}
+    if tamanho is not None:
+        kwargs['tamanho'] = tamanho
+    if itens is not None:
+        kwargs['itens'] = itens
+    return GERADORES[site](**kwargs)
+
+
+def corpus() -> Dict[str, bytes]:
+    """Corpus de fixtures dos benchmarks: nome do arquivo -> bytes"""
+    arquivos: Dict[str, bytes] = {}
+    for p in (1, 2):
+        arquivos[f"mercado_livre_p{p}.html"] = pagina_mercado_livre(pagina=p)
+        arquivos[f"amazon_p{p}.html"] = pagina_amazon(pagina=p)
+        arquivos[f"ebay_p{p}.html"] = pagina_ebay(pagina=p)
+    arquivos["mercado_livre_layout_alternativo.html"] = pagina_mercado_livre(alternativo=True)
+    arquivos["captcha.html"] = pagina_captcha()
+    return arquivos
+
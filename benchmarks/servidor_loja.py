@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+🏪 Loja Local (stand-in dos marketplaces)
+Servidor HTTP que imita as buscas do Mercado Livre, Amazon e eBay para
+medir o caminho de scraping de ponta a ponta sem tocar nos sites reais.
+
+Rotas no formato que ``sites.redirecionar_sites`` (SCRAPER_SITES_BASE_URL) gera:
+  /mercado_livre/<termo>[_Desde_<n>]      -> página (n - 1) // 50 + 1
+  /amazon/s?k=<termo>[&page=<n>]
+  /ebay/sch/i.html?_nkw=<termo>[&_pgn=<n>]
+  /<site>, /<site>/ofertas, / ...         -> página inicial (aquecimento da sessão)
+  /__estado (GET)                         -> contadores de requisições por site/status
+  /__config (GET/POST)                    -> configuração atual / altera em tempo de execução
+
+Comportamento configurável (linha de comando ou POST /__config):
+latência média e jitter, tamanho e itens por página, páginas com resultado
+(depois vem a página vazia), taxas de 403/429 e de páginas de captcha.
+
+Uso:
+  python -m benchmarks.servidor_loja --porta 8900 --latencia-ms 150 --taxa-429 0.02
+"""
+
+import os
+import sys
+import random
+import asyncio
+import argparse
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import Response  # noqa: E402
+
+from benchmarks import paginas_sinteticas  # noqa: E402
+
+
+CONFIG_PADRAO = {
+    'latencia_ms': 150.0,     # média
+    'jitter_ms': 50.0,        # +- uniforme
+    'tamanho': None,          # bytes por página (None = padrão do gerador de cada site)
+    'itens': None,            # itens por página (None = padrão de cada site)
+    'paginas': 20,            # páginas com resultado por busca
+    'taxa_403': 0.0,
+    'taxa_429': 0.0,
+    'taxa_captcha': 0.0,
+    'semente': 0,
+}
+
+ITENS_POR_PAGINA_ML = 50
+
+
+class Loja:
+    """Estado do servidor: configuração, contadores e cache das páginas geradas"""
+
+    def __init__(self, config: Optional[Dict] = None, max_cache: int = 256):
+        self.config = dict(CONFIG_PADRAO, **(config or {}))
+        self.contadores: Counter = Counter()
+        self.bytes_enviados = 0
+        self.max_cache = max_cache
+        self._cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._rnd = random.Random(self.config['semente'])
+
+    def configurar(self, **valores):
+        desconhecidos = set(valores) - set(CONFIG_PADRAO)
+        if desconhecidos:
+            raise ValueError(f"Opções desconhecidas: {sorted(desconhecidos)}")
+        self.config.update(valores)
+        if 'semente' in valores:
+            self._rnd = random.Random(valores['semente'])
+        self._cache.clear()
+
+    def pagina(self, site: str, termo: str, numero: int) -> bytes:
+        """Página de resultados (gerada uma vez e guardada num LRU)"""
+        if numero > self.config['paginas']:
+            return paginas_sinteticas.pagina_vazia(termo)
+        chave = (site, termo, numero)
+        conteudo = self._cache.get(chave)
+        if conteudo is None:
+            conteudo = paginas_sinteticas.pagina(site, termo, numero, tamanho=self.config['tamanho'],
+                                                 itens=self.config['itens'], semente=self.config['semente'])
+            self._cache[chave] = conteudo
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(chave)
+        return conteudo
+
+    def sortear_falha(self) -> Optional[str]:
+        """'403', '429', 'captcha' ou None conforme as taxas configuradas"""
+        r = self._rnd.random()
+        for falha, taxa in (('403', self.config['taxa_403']), ('429', self.config['taxa_429']),
+                            ('captcha', self.config['taxa_captcha'])):
+            if r < taxa:
+                return falha
+            r -= taxa
+        return None
+
+    def latencia(self) -> float:
+        media, jitter = self.config['latencia_ms'], self.config['jitter_ms']
+        return max(0.0, media + self._rnd.uniform(-jitter, jitter)) / 1000
+
+    def estado(self) -> Dict:
+        return {
+            'requisicoes': sum(v for (tipo, _, _), v in self.contadores.items() if tipo == 'req'),
+            'por_site_status': {f"{site} {status}": n for (tipo, site, status), n in sorted(self.contadores.items())
+                                if tipo == 'req'},
+            'bytes_enviados': self.bytes_enviados,
+            'paginas_em_cache': len(self._cache),
+        }
+
+
+def _pagina_pedida(site: str, caminho: str, query: Dict[str, str]) -> Optional[Tuple[str, int]]:
+    """(termo, número da página) a partir da paginação de cada site; None se não é uma busca"""
+    if site == 'mercado_livre':
+        if not caminho or caminho in ('ofertas',) or '/' in caminho:
+            return None
+        termo, _, desde = caminho.partition('_Desde_')
+        inicio = int(desde) if desde.isdigit() else 1
+        return termo.replace('+', ' ').replace('-', ' '), (inicio - 1) // ITENS_POR_PAGINA_ML + 1
+    if site == 'amazon' and caminho == 's' and 'k' in query:
+        return query['k'], int(query.get('page') or 1)
+    if site == 'ebay' and caminho == 'sch/i.html' and '_nkw' in query:
+        return query['_nkw'], int(query.get('_pgn') or 1)
+    return None
+
+
+def criar_app(loja: Optional[Loja] = None) -> FastAPI:
+    loja = loja or Loja()
+    app = FastAPI(title="Loja local (benchmarks)", docs_url=None, redoc_url=None)
+    app.state.loja = loja
+
+    @app.get("/__estado")
+    async def estado():
+        return loja.estado()
+
+    @app.get("/__config")
+    async def ver_config():
+        return loja.config
+
+    @app.post("/__config")
+    async def alterar_config(request: Request):
+        try:
+            loja.configurar(**(await request.json()))
+        except ValueError as e:
+            return Response(str(e), status_code=400)
+        return loja.config
+
+    @app.get("/{site}/{caminho:path}")
+    @app.get("/{site}")
+    @app.get("/")
+    async def pagina(request: Request, site: str = '', caminho: str = ''):
+        await asyncio.sleep(loja.latencia())
+        if site not in paginas_sinteticas.GERADORES:
+            return _responder(loja, site, 200, paginas_sinteticas.pagina_vazia())
+        pedido = _pagina_pedida(site, caminho, dict(request.query_params))
+        if pedido is None:
+            # Página inicial / navegação do aquecimento da sessão
+            return _responder(loja, site, 200, paginas_sinteticas.pagina_vazia())
+        falha = loja.sortear_falha()
+        if falha == '403':
+            return _responder(loja, site, 403, b'<html><body><h1>403 Forbidden</h1></body></html>')
+        if falha == '429':
+            return _responder(loja, site, 429, b'<html><body>Too Many Requests</body></html>', {'Retry-After': '1'})
+        if falha == 'captcha':
+            return _responder(loja, site, 200, paginas_sinteticas.pagina_captcha(site), rotulo='captcha')
+        termo, numero = pedido
+        return _responder(loja, site, 200, loja.pagina(site, termo, numero))
+
+    return app
+
+
+def _responder(loja: Loja, site: str, status: int, conteudo: bytes, headers: Optional[Dict] = None,
+               rotulo: Optional[str] = None) -> Response:
+    loja.contadores[('req', site, rotulo or str(status))] += 1
+    loja.bytes_enviados += len(conteudo)
+    return Response(conteudo, status_code=status, media_type='text/html; charset=utf-8', headers=headers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loja local que imita as buscas dos marketplaces")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8900)
+    parser.add_argument('--latencia-ms', type=float, default=CONFIG_PADRAO['latencia_ms'])
+    parser.add_argument('--jitter-ms', type=float, default=CONFIG_PADRAO['jitter_ms'])
+    parser.add_argument('--tamanho', type=int, default=None, help="bytes por página")
+    parser.add_argument('--itens', type=int, default=None, help="itens por página")
+    parser.add_argument('--paginas', type=int, default=CONFIG_PADRAO['paginas'],
+                        help="páginas com resultado por busca")
+    parser.add_argument('--taxa-403', type=float, default=0.0)
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--taxa-captcha', type=float, default=0.0)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    loja = Loja({
+        'latencia_ms': args.latencia_ms, 'jitter_ms': args.jitter_ms, 'tamanho': args.tamanho,
+        'itens': args.itens, 'paginas': args.paginas, 'taxa_403': args.taxa_403,
+        'taxa_429': args.taxa_429, 'taxa_captcha': args.taxa_captcha, 'semente': args.semente,
+    })
+    uvicorn.run(criar_app(loja), host=args.host, port=args.porta, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,7 @@ import time
 import random
 import tempfile
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from parser_backends import No, parse_html
 import subprocess
 
 
@@ -187,12 +187,12 @@ const puppeteer = require('puppeteer');
 real_browser = RealBrowserScraper()
 
 
-def scrape_with_real_browser(url: str) -> Optional[BeautifulSoup]:
+def scrape_with_real_browser(url: str, parser: Optional[str] = None) -> Optional[No]:
     """Interface principal para scraping com navegador real"""
     content = real_browser.scrape_url(url)
     
     if content:
-        return BeautifulSoup(content, 'html.parser')
+        return parse_html(content, parser)
     else:
         return None
 
@@ -51,10 +51,10 @@ def iniciar_scraping(site, termo_busca, max_paginas=3):
         print(f"Erro de conexão: {e}")
         return None
 
-def consultar_job(job_id):
-    """Consulta o status de um job"""
+def consultar_job(job_id, **params):
+    """Consulta o status de um job (params: offset, limit, since, apenas_status)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/job/{job_id}")
+        response = requests.get(f"{API_BASE_URL}/job/{job_id}", params=params)
         if response.status_code == 200:
             return response.json()
         else:
@@ -64,17 +64,63 @@ def consultar_job(job_id):
         print(f"Erro de conexão: {e}")
         return None
 
+def acompanhar_eventos(job_id, timeout=300):
+    """Acompanha o job pelo stream SSE (/job/{id}/events). Retorna o evento de fim ou None."""
+    start_time = time.time()
+    # Timeout de leitura folgado: o servidor manda keepalive a cada 15 s
+    with requests.get(f"{API_BASE_URL}/job/{job_id}/events", stream=True, timeout=(5, 60)) as response:
+        if response.status_code != 200:
+            return None
+        for linha in response.iter_lines(decode_unicode=True):
+            if time.time() - start_time > timeout:
+                return None
+            if not linha or not linha.startswith('data:'):
+                continue
+            evento = json.loads(linha[5:])
+            dados = evento.get('dados') or {}
+            if evento['tipo'] == 'progresso':
+                print(f"Progresso: {dados.get('mensagem')}")
+            elif evento['tipo'] == 'pagina':
+                print(f"📄 Página {dados['pagina']}: +{dados['produtos_pagina']} produtos "
+                      f"(total {dados['total_produtos']})")
+            elif evento['tipo'] == 'bloqueio':
+                print(f"🚫 Bloqueio na página {dados.get('pagina')}: {dados.get('motivo')}")
+            elif evento['tipo'] == 'fim':
+                return evento
+    return None
+
 def aguardar_conclusao(job_id, timeout=300):
-    """Aguarda a conclusão de um job"""
+    """Aguarda a conclusão de um job (eventos SSE; polling como fallback)"""
     start_time = time.time()
     
     print(f"\n⏳ Aguardando conclusão do job {job_id}...")
     
+    try:
+        fim = acompanhar_eventos(job_id, timeout)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Stream de eventos indisponível ({e}); usando polling")
+        fim = None
+    if fim is not None:
+        job_data = consultar_job(job_id)  # Produtos numa consulta só, ao final
+        if job_data and job_data['status'] == 'failed':
+            print(f"❌ Job falhou: {job_data.get('erro', 'Erro desconhecido')}")
+        elif job_data and job_data['status'] == 'cancelled':
+            print(f"⏹️ Job cancelado: {job_data.get('progress')}")
+        return job_data
+    
+    # Cada consulta pede só os produtos novos desde o cursor anterior
+    produtos = []
+    cursor = 0
     while time.time() - start_time < timeout:
-        job_data = consultar_job(job_id)
+        job_data = consultar_job(job_id, since=cursor)
         if not job_data:
             return None
         
+        produtos.extend(job_data.get('produtos') or [])
+        if job_data.get('cursor') is not None:
+            cursor = job_data['cursor']
+        job_data['produtos'] = produtos
+        
         status = job_data['status']
         progress = job_data.get('progress', '')
         
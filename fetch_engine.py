@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+⚡ Fetch Engine Assíncrono
+Executa as requisições de scraping em um único event loop (httpx),
+com várias páginas em voo por job e limite de concorrência por domínio.
+"""
+
+import os
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from job_timing import medir
+from rate_limiter import dominio_base, rate_limiter
+
+
+class SessaoAsync:
+    """Sessão HTTP assíncrona com cookies e conexões keep-alive.
+
+    O httpx define proxy por cliente (e não por requisição como o requests),
+    então a sessão mantém um ``AsyncClient`` para cada proxy utilizado.
+    """
+
+    def __init__(self, proxy: Optional[str] = None, max_conexoes: int = 5):
+        self.proxy_padrao = proxy
+        self.max_conexoes = max_conexoes
+        self.criada_em = time.time()
+        self.usos = 0  # Jobs que já usaram esta sessão (pool)
+        self.bloqueada = False  # Marcada quando o site bloqueia a sessão
+        self._clientes: Dict[Optional[str], httpx.AsyncClient] = {}
+
+    @property
+    def proxies(self) -> Dict[str, str]:
+        """Compatível com ``requests.Session.proxies``"""
+        if not self.proxy_padrao:
+            return {}
+        return {'http': self.proxy_padrao, 'https': self.proxy_padrao}
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        return self._cliente(None).cookies
+
+    def _cliente(self, proxy: Optional[str]) -> httpx.AsyncClient:
+        chave = proxy or self.proxy_padrao
+        cliente = self._clientes.get(chave)
+        if cliente is None:
+            cliente = httpx.AsyncClient(
+                proxy=chave,
+                timeout=httpx.Timeout(30, connect=15),
+                limits=httpx.Limits(
+                    max_connections=self.max_conexoes,
+                    max_keepalive_connections=2  # Navegadores limitam o pool
+                ),
+                follow_redirects=True,
+            )
+            self._clientes[chave] = cliente
+        return cliente
+
+    async def get(self, url: str, headers: Optional[Dict] = None, timeout=None,
+                  proxy: Optional[str] = None, allow_redirects: bool = True) -> httpx.Response:
+        """GET com assinatura próxima de ``requests.Session.get``"""
+        kwargs = {'headers': headers, 'follow_redirects': allow_redirects}
+        if timeout is not None:
+            if isinstance(timeout, tuple):
+                connect, read = timeout
+                kwargs['timeout'] = httpx.Timeout(read, connect=connect)
+            else:
+                kwargs['timeout'] = timeout
+        return await self._cliente(proxy).get(url, **kwargs)
+
+    async def aclose(self):
+        for cliente in list(self._clientes.values()):
+            try:
+                await cliente.aclose()
+            except Exception:
+                pass
+        self._clientes.clear()
+
+
+class AsyncFetchEngine:
+    """Event loop dedicado para os jobs de scraping.
+
+    Roda em uma thread própria para que o parsing (CPU) dos jobs não
+    trave o event loop do uvicorn que atende a API.
+    """
+
+    def __init__(self):
+        # Máximo de requisições simultâneas para o mesmo domínio (somando todos os jobs)
+        self.concorrencia_por_dominio = max(1, int(os.environ.get("SCRAPER_DOMAIN_CONCURRENCY", "4")))
+        # Páginas de um mesmo job buscadas ao mesmo tempo
+        self.paginas_em_voo = max(1, int(os.environ.get("SCRAPER_PAGES_IN_FLIGHT", "3")))
+        # Modo pipeline: download da página N+1 sobreposto ao parsing da página N
+        self.modo_pipeline = os.environ.get("SCRAPER_PIPELINE", "0") == "1"
+        # Páginas baixadas aguardando parsing (fila limitada entre os estágios)
+        self.tamanho_fila_pipeline = max(1, int(os.environ.get("SCRAPER_PIPELINE_QUEUE", "2")))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._semaforos: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop do engine (iniciado sob demanda)"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                pronto = threading.Event()
+
+                def _rodar():
+                    self._loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(self._loop)
+                    pronto.set()
+                    self._loop.run_forever()
+
+                self._thread = threading.Thread(target=_rodar, name="fetch-engine", daemon=True)
+                self._thread.start()
+                pronto.wait()
+            return self._loop
+
+    def submit(self, coro):
+        """Agenda uma corrotina no loop do engine (retorna concurrent.futures.Future)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Executa uma corrotina no engine e aguarda o resultado (uso síncrono)"""
+        return self.submit(coro).result(timeout)
+
+    def _semaforo(self, dominio: str) -> asyncio.Semaphore:
+        # Só é chamado de dentro do loop do engine, não precisa de lock
+        sem = self._semaforos.get(dominio)
+        if sem is None:
+            sem = asyncio.Semaphore(self.concorrencia_por_dominio)
+            self._semaforos[dominio] = sem
+        return sem
+
+    async def get(self, sessao: SessaoAsync, url: str, **kwargs) -> httpx.Response:
+        """GET respeitando o rate limit global e o limite de concorrência do domínio"""
+        # Mesma chave do rate limiter: subdomínios do site (lista./www.) dividem o limite
+        dominio = dominio_base(url)
+        semaforo = self._semaforo(dominio)
+        with medir('espera_rate'):
+            await rate_limiter.aguardar_async(dominio)
+            # Fila pelo limite de concorrência do domínio também é espera
+            await semaforo.acquire()
+        try:
+            with medir('rede'):
+                return await sessao.get(url, **kwargs)
+        finally:
+            semaforo.release()
+
+    def encerrar(self):
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+# Instância global
+fetch_engine = AsyncFetchEngine()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+📡 Eventos de Jobs
+Canal de eventos por job (progresso, página concluída, bloqueio, fim) para
+SSE/WebSocket. Cada job tem um buffer circular limitado com ids crescentes:
+quem assina tarde (ou reconecta com Last-Event-ID) recebe o que ainda está
+no buffer e depois os eventos novos, sem polling.
+
+Os eventos são publicados do event loop do fetch_engine e consumidos no loop
+do servidor; o aviso entre eles é feito com call_soon_threadsafe.
+
+Configuração via ambiente:
+  SCRAPER_EVENTS_BUFFER="200"  -> eventos guardados por job
+  SCRAPER_EVENTS_JOBS="500"    -> jobs com buffer em memória (os já encerrados saem primeiro)
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Dict, Optional
+
+
+class _Canal:
+    __slots__ = ('eventos', 'seq', 'assinantes', 'encerrado')
+
+    def __init__(self, tamanho: int):
+        self.eventos: deque = deque(maxlen=tamanho)
+        self.seq = 0
+        self.assinantes = set()
+        self.encerrado = False
+
+
+class CanalEventos:
+    """Buffers de eventos por job + assinatura assíncrona"""
+
+    TIPO_FIM = 'fim'
+
+    def __init__(self):
+        self.tamanho_buffer = max(1, int(os.environ.get("SCRAPER_EVENTS_BUFFER", "200")))
+        self.max_jobs = max(1, int(os.environ.get("SCRAPER_EVENTS_JOBS", "500")))
+        self._canais: "OrderedDict[str, _Canal]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _canal(self, job_id: str) -> _Canal:
+        canal = self._canais.get(job_id)
+        if canal is None:
+            canal = self._canais[job_id] = _Canal(self.tamanho_buffer)
+            self._limitar()
+        return canal
+
+    def _limitar(self):
+        excesso = len(self._canais) - self.max_jobs
+        for job_id in list(self._canais):
+            if excesso <= 0:
+                break
+            canal = self._canais[job_id]
+            if canal.encerrado and not canal.assinantes:
+                del self._canais[job_id]
+                excesso -= 1
+
+    def tem(self, job_id: str) -> bool:
+        return job_id in self._canais
+
+    def ultimo_id(self, job_id: str) -> int:
+        """Id do último evento publicado para o job (0 se não há buffer)"""
+        with self._lock:
+            canal = self._canais.get(job_id)
+            return canal.seq if canal is not None else 0
+
+    def publicar(self, job_id: str, tipo: str, dados: Optional[Dict] = None) -> Dict:
+        """Acrescenta um evento ao buffer do job e acorda os assinantes (thread-safe)"""
+        with self._lock:
+            canal = self._canal(job_id)
+            canal.seq += 1
+            evento = {'id': canal.seq, 'tipo': tipo, 'ts': time.time(), 'dados': dados or {}}
+            canal.eventos.append(evento)
+            if tipo == self.TIPO_FIM:
+                canal.encerrado = True
+            assinantes = list(canal.assinantes)
+        for loop, aviso in assinantes:
+            try:
+                loop.call_soon_threadsafe(aviso.set)
+            except RuntimeError:
+                pass  # loop do assinante já fechado
+        return evento
+
+    def semear(self, job_id: str, eventos) -> bool:
+        """Cria o buffer com os eventos dados (tipo, dados) se o job ainda não tem um"""
+        with self._lock:
+            if job_id in self._canais:
+                return False
+            canal = self._canal(job_id)
+            for tipo, dados in eventos:
+                canal.seq += 1
+                canal.eventos.append({'id': canal.seq, 'tipo': tipo, 'ts': time.time(), 'dados': dados})
+                canal.encerrado = canal.encerrado or tipo == self.TIPO_FIM
+            return True
+
+    def descartar(self, job_id: str):
+        with self._lock:
+            self._canais.pop(job_id, None)
+
+    async def assinar(self, job_id: str, desde: int = 0,
+                      keepalive: float = 15.0) -> AsyncIterator[Optional[Dict]]:
+        """Eventos com id > ``desde`` até o evento de fim; ``None`` a cada ``keepalive`` s sem eventos"""
+        aviso = asyncio.Event()
+        chave = (asyncio.get_running_loop(), aviso)
+        with self._lock:
+            canal = self._canal(job_id)
+            canal.assinantes.add(chave)
+        try:
+            while True:
+                aviso.clear()
+                with self._lock:
+                    novos = [e for e in canal.eventos if e['id'] > desde]
+                    encerrado = canal.encerrado
+                for evento in novos:
+                    desde = evento['id']
+                    yield evento
+                    if evento['tipo'] == self.TIPO_FIM:
+                        return
+                if encerrado:
+                    return
+                try:
+                    await asyncio.wait_for(aviso.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                canal.assinantes.discard(chave)
+
+
+# Instância global
+canal_eventos = CanalEventos()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+📦 Exportação de Resultados
+Gera o arquivo de resultados de um job (xlsx, csv, parquet, ndjson) direto
+em disco, em blocos, sem montar o arquivo inteiro em memória: o xlsx usa o
+modo write-only do openpyxl, csv/ndjson são escritos bloco a bloco e o
+parquet em row groups.
+
+Jobs concluídos não mudam, então cada arquivo gerado fica em cache por
+(job, formato); o cache é limitado por tamanho e os arquivos usados há
+mais tempo saem primeiro.
+
+Configuração via ambiente:
+  SCRAPER_EXPORT_DIR="/tmp/scraping/exports" -> pasta do cache de exportações
+  SCRAPER_EXPORT_CACHE_MB="200"              -> tamanho máximo do cache
+  SCRAPER_EXPORT_CHUNK="5000"                -> linhas por bloco de escrita
+"""
+
+import os
+import csv
+import json
+import glob
+import time
+import threading
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from price_normalizer import preencher_precos_df
+from result_store import COLUNAS, ResultadosColunares
+
+
+# formato -> (media type, extensão)
+FORMATOS: Dict[str, Tuple[str, str]] = {
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+# Arquivos usados há menos tempo que isso não são removidos (podem estar sendo enviados)
+_EM_USO_S = 60
+
+
+class FormatoIndisponivel(Exception):
+    """Formato desconhecido ou sem a dependência opcional instalada"""
+
+
+class DependenciaAusente(FormatoIndisponivel):
+    """Formato válido, mas a biblioteca que o gera não está instalada (ex: pyarrow)"""
+
+
+def _precos_num(resultados: ResultadosColunares) -> np.ndarray:
+    """preco_num completo (jobs antigos podem ter só o texto do preço)"""
+    precos_num = np.asarray(resultados.preco_num[:len(resultados)], dtype=np.float64)
+    if not np.isnan(precos_num).any():
+        return precos_num
+    return preencher_precos_df(resultados.to_dataframe())['preco_num'].to_numpy()
+
+
+def _linhas(resultados: ResultadosColunares, tamanho_bloco: int) -> Iterator[List[tuple]]:
+    """Blocos de linhas na ordem de COLUNAS, com NaN -> None"""
+    precos_num = _precos_num(resultados)
+    for inicio in range(0, len(resultados), tamanho_bloco):
+        fim = inicio + tamanho_bloco
+        nome, preco, _, link, site, avaliacao, reviews = resultados.colunas(inicio, fim)
+        numeros = [None if v != v else float(v) for v in precos_num[inicio:fim]]
+        yield list(zip(nome, preco, numeros, link, site, avaliacao, reviews))
+
+
+class ExportadorJobs:
+    """Gera e guarda em cache os arquivos de exportação dos jobs"""
+
+    def __init__(self):
+        self.pasta = os.environ.get("SCRAPER_EXPORT_DIR", "/tmp/scraping/exports")
+        self.max_bytes = int(float(os.environ.get("SCRAPER_EXPORT_CACHE_MB", "200")) * 1024 * 1024)
+        self.tamanho_bloco = max(1, int(os.environ.get("SCRAPER_EXPORT_CHUNK", "5000")))
+        self._lock = threading.Lock()
+        self._gerando: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.gerados = 0
+
+    def caminho(self, chave: str, formato: str) -> str:
+        return os.path.join(self.pasta, f"{chave}.{FORMATOS[formato][1]}")
+
+    def exportar(self, chave: str, resultados: ResultadosColunares, formato: str) -> str:
+        """Caminho do arquivo do job no formato pedido (gerado só se não estiver em cache)"""
+        if formato not in FORMATOS:
+            raise FormatoIndisponivel(f"Formato inválido: {formato}. Disponíveis: {list(FORMATOS)}")
+        caminho = self.caminho(chave, formato)
+        with self._lock:
+            gerando = self._gerando.setdefault(caminho, threading.Lock())
+        try:
+            # Downloads simultâneos do mesmo arquivo: só um gera, os outros esperam
+            with gerando:
+                if os.path.exists(caminho):
+                    os.utime(caminho)  # LRU pelo mtime
+                    self.hits += 1
+                    return caminho
+                os.makedirs(self.pasta, exist_ok=True)
+                tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    getattr(self, f"_escrever_{formato}")(resultados, tmp)
+                    os.replace(tmp, caminho)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                self.gerados += 1
+        finally:
+            with self._lock:
+                self._gerando.pop(caminho, None)
+        self._limitar(manter=caminho)
+        return caminho
+
+    def descartar(self, chave: str):
+        """Remove do cache os arquivos de um job (job deletado)"""
+        for formato in FORMATOS:
+            try:
+                os.remove(self.caminho(chave, formato))
+            except OSError:
+                pass
+
+    def _limitar(self, manter: str):
+        arquivos = []
+        for caminho in glob.glob(os.path.join(self.pasta, '*.*')):
+            if caminho.endswith('.tmp'):
+                continue
+            try:
+                st = os.stat(caminho)
+            except OSError:
+                continue
+            arquivos.append((st.st_mtime, st.st_size, caminho))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        agora = time.time()
+        for mtime, tamanho, caminho in sorted(arquivos):
+            if total <= self.max_bytes:
+                break
+            if caminho == manter or agora - mtime < _EM_USO_S:
+                continue
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+
+    # ---------- Formatos ----------
+
+    def _escrever_xlsx(self, resultados: ResultadosColunares, destino: str):
+        from openpyxl import Workbook
+        # write-only: as linhas vão para o XML temporário à medida que são escritas
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Produtos')
+        ws.append(list(COLUNAS))
+        for bloco in _linhas(resultados, self.tamanho_bloco):
+            for linha in bloco:
+                ws.append(linha)
+        wb.save(destino)
+
+    def _escrever_csv(self, resultados: ResultadosColunares, destino: str):
+        # utf-8-sig: o Excel reconhece a acentuação ao abrir o CSV
+        with open(destino, 'w', encoding='utf-8-sig', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(COLUNAS)
+            for bloco in _linhas(resultados, self.tamanho_bloco):
+                escritor.writerows(bloco)
+
+    def _escrever_ndjson(self, resultados: ResultadosColunares, destino: str):
+        with open(destino, 'w', encoding='utf-8') as f:
+            for bloco in _linhas(resultados, self.tamanho_bloco):
+                f.write(''.join(
+                    json.dumps(dict(zip(COLUNAS, linha)), ensure_ascii=False) + '\n' for linha in bloco
+                ))
+
+    def _escrever_parquet(self, resultados: ResultadosColunares, destino: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise DependenciaAusente("Exportação parquet requer pyarrow (pip install pyarrow)")
+        tabela = resultados.to_arrow()
+        tabela = tabela.set_column(
+            COLUNAS.index('preco_num'), 'preco_num', pa.array(_precos_num(resultados), from_pandas=True)
+        )
+        pq.write_table(tabela, destino, row_group_size=self.tamanho_bloco)
+
+    def estado(self) -> Dict:
+        arquivos = glob.glob(os.path.join(self.pasta, '*.*'))
+        return {
+            'pasta': self.pasta,
+            'arquivos': len(arquivos),
+            'bytes': sum(os.path.getsize(c) for c in arquivos if os.path.exists(c)),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'gerados': self.gerados,
+        }
+
+
+# Instância global
+exportador_jobs = ExportadorJobs()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+📒 Journal de Jobs
+Persistência append-only dos jobs: cada mudança vira uma linha JSON no
+journal (custo proporcional à mudança, não ao histórico). Uma thread em
+background compacta periodicamente snapshot + journal num snapshot novo
+(JSONL, um job por linha), gravado em arquivo temporário e trocado com
+os.replace.
+
+Eventos do journal:
+  {"op": "job", "id": ..., "dados": {...}}        -> metadados do job (sem produtos)
+  {"op": "produtos", "id": ..., "produtos": [...]} -> produtos, gravados uma vez ao final do job
+  {"op": "produtos", "id": ..., "de": ...}         -> produtos são os do job "de" (seguidor single-flight)
+  {"op": "del", "id": ...}                         -> job removido
+
+Índice: ao lado do snapshot fica <base>.snapshot.idx.json (job_id -> offset,
+tamanho e resumo da linha). A carga lê só esse índice e o journal pendente
+(linhas de produtos nem são decodificadas); o job completo é lido do disco
+com seek quando alguém pede (``ler``).
+
+Configuração via ambiente:
+  SCRAPER_JOBS_FILE="jobs_data.json"   -> arquivo legado; snapshot/journal ficam ao lado
+                                          (jobs_data.snapshot.jsonl / jobs_data.journal.jsonl)
+                                          e ele é migrado na primeira execução
+  SCRAPER_JOURNAL_COMPACT_EVENTS="500" -> eventos no journal que disparam a compactação
+  SCRAPER_JOURNAL_COMPACT_S="30"       -> intervalo da verificação em background
+"""
+
+import os
+import re
+import json
+import glob
+import time
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Campos do job que ficam no índice (respondem /jobs, /metrics e /healthz sem ler o job)
+CAMPOS_RESUMO = ('job_id', 'status', 'progress', 'total_produtos', 'erro', 'created_at',
+                 'completed_at', 'config', 'lider', 'seguidores')
+
+# Linhas de produtos começam sempre assim (ver _linha): o id sai sem decodificar a lista
+_PREFIXO_PRODUTOS = re.compile(rb'\{"op":"produtos","id":"([^"\\]*)"')
+
+
+class Local(NamedTuple):
+    """Posição de uma linha JSON em disco"""
+    arquivo: str
+    offset: int
+    tamanho: int
+
+
+def resumo_job(dados: Dict) -> Dict:
+    return {campo: dados[campo] for campo in CAMPOS_RESUMO if campo in dados}
+
+
+def _linhas(caminho: str) -> Iterator[Tuple[int, bytes]]:
+    """(offset, linha) das linhas completas de um JSONL; uma linha cortada por crash é ignorada"""
+    try:
+        with open(caminho, 'rb') as f:
+            offset = 0
+            for linha in f:
+                if linha.endswith(b'\n') and linha.strip():
+                    yield offset, linha
+                offset += len(linha)
+    except FileNotFoundError:
+        return
+
+
+def _ler_jsonl(caminho: str) -> Iterator[Dict]:
+    for _, linha in _linhas(caminho):
+        try:
+            yield json.loads(linha)
+        except ValueError:
+            continue
+
+
+def _ler_local(local: Local) -> bytes:
+    with open(local.arquivo, 'rb') as f:
+        f.seek(local.offset)
+        return f.read(local.tamanho)
+
+
+def _linha(obj: Dict) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+
+
+def _aplicar(jobs: Dict[str, Dict], evento: Dict):
+    op, job_id = evento.get('op'), evento.get('id')
+    if op == 'job':
+        anterior = jobs.get(job_id)
+        dados = dict(evento.get('dados') or {})
+        if anterior is not None and 'produtos' in anterior:
+            dados['produtos'] = anterior['produtos']
+        jobs[job_id] = dados
+    elif op == 'produtos' and job_id in jobs:
+        if evento.get('de'):
+            jobs[job_id].pop('produtos', None)
+            jobs[job_id]['produtos_de'] = evento['de']
+        else:
+            jobs[job_id].pop('produtos_de', None)
+            jobs[job_id]['produtos'] = evento.get('produtos') or []
+    elif op == 'del':
+        jobs.pop(job_id, None)
+
+
+class JobJournal:
+    """Journal append-only + snapshot indexado, compactado em background"""
+
+    def __init__(self, arquivo_legado: Optional[str] = None):
+        self.arquivo_legado = arquivo_legado or os.environ.get("SCRAPER_JOBS_FILE", "jobs_data.json")
+        base = os.path.splitext(self.arquivo_legado)[0]
+        self.snapshot_path = base + '.snapshot.jsonl'
+        self.indice_path = base + '.snapshot.idx.json'
+        self.journal_path = base + '.journal.jsonl'
+        self.compactar_a_cada = max(1, int(os.environ.get("SCRAPER_JOURNAL_COMPACT_EVENTS", "500")))
+        self.intervalo = float(os.environ.get("SCRAPER_JOURNAL_COMPACT_S", "30"))
+        self._lock = threading.Lock()
+        self._compactando = threading.Lock()
+        self._arquivo = None
+        self._eventos = 0
+        self._thread: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        # job_id -> {'resumo': {...}, 'meta': Local, 'produtos': Local | None}
+        self._indice: Dict[str, Dict] = {}
+
+    # ---------- Índice ----------
+
+    def _indexar_evento(self, evento: Dict, local: Local):
+        op, job_id = evento.get('op'), evento.get('id')
+        if op == 'job':
+            resumo = resumo_job(evento.get('dados') or {})
+            entrada = self._indice.get(job_id)
+            if entrada is None:
+                self._indice[job_id] = {'resumo': resumo, 'meta': local, 'produtos': None}
+            else:
+                entrada['resumo'] = resumo
+                entrada['meta'] = local
+        elif op == 'produtos' and job_id in self._indice:
+            self._indice[job_id]['produtos'] = local
+        elif op == 'del':
+            self._indice.pop(job_id, None)
+
+    def _indexar_journal(self, caminho: str) -> int:
+        eventos = 0
+        for offset, linha in _linhas(caminho):
+            eventos += 1
+            local = Local(caminho, offset, len(linha))
+            m = _PREFIXO_PRODUTOS.match(linha)
+            if m:
+                self._indexar_evento({'op': 'produtos', 'id': m.group(1).decode('utf-8')}, local)
+                continue
+            try:
+                self._indexar_evento(json.loads(linha), local)
+            except ValueError:
+                continue
+        return eventos
+
+    def _indexar_snapshot(self):
+        """Índice do snapshot: do .idx quando ele corresponde ao snapshot, senão varrendo o snapshot"""
+        try:
+            st = os.stat(self.snapshot_path)
+        except OSError:
+            return
+        try:
+            with open(self.indice_path, 'r', encoding='utf-8') as f:
+                salvo = json.load(f)
+            if salvo['snapshot_bytes'] == st.st_size and salvo['snapshot_mtime_ns'] == st.st_mtime_ns:
+                self._apontar_snapshot(salvo['jobs'], novos=True)
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        entradas = []
+        for offset, linha in _linhas(self.snapshot_path):
+            try:
+                dados = json.loads(linha)
+            except ValueError:
+                continue
+            if dados.get('job_id'):
+                entradas.append([dados['job_id'], offset, len(linha), resumo_job(dados)])
+        self._apontar_snapshot(entradas, novos=True)
+        self._gravar_indice(entradas)
+
+    def _apontar_snapshot(self, entradas: List, novos: bool = False):
+        """Aponta o índice para as linhas do snapshot (as do journal atual continuam valendo)"""
+        for job_id, offset, tamanho, resumo in entradas:
+            local = Local(self.snapshot_path, offset, tamanho)
+            entrada = self._indice.get(job_id)
+            if entrada is None:
+                if novos:
+                    self._indice[job_id] = {'resumo': resumo, 'meta': local, 'produtos': local}
+                continue  # removido durante a compactação
+            for campo in ('meta', 'produtos'):
+                if entrada[campo] is not None and entrada[campo].arquivo != self.journal_path:
+                    entrada[campo] = local
+
+    def _renomear_locais(self, de: str, para: str):
+        for entrada in self._indice.values():
+            for campo in ('meta', 'produtos'):
+                if entrada[campo] is not None and entrada[campo].arquivo == de:
+                    entrada[campo] = entrada[campo]._replace(arquivo=para)
+
+    def _gravar_indice(self, entradas: List):
+        st = os.stat(self.snapshot_path)
+        tmp = f"{self.indice_path}.{os.getpid()}.tmp"
+        # Sem fsync: se o índice se perder, é refeito a partir do snapshot
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'snapshot_bytes': st.st_size, 'snapshot_mtime_ns': st.st_mtime_ns, 'jobs': entradas},
+                      f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp, self.indice_path)
+
+    # ---------- Leitura ----------
+
+    def _migrar_legado(self):
+        """Converte o jobs_data.json antigo (JSON único) no primeiro snapshot"""
+        if os.path.exists(self.snapshot_path) or not os.path.exists(self.arquivo_legado):
+            return
+        try:
+            with open(self.arquivo_legado, 'r', encoding='utf-8') as f:
+                legado = json.load(f)
+        except (OSError, ValueError):
+            return
+        tmp, entradas = self._escrever_snapshot((dados, None) for dados in legado.values() if isinstance(dados, dict))
+        os.replace(tmp, self.snapshot_path)
+        self._gravar_indice(entradas)
+
+    def _rotacionados(self) -> List[str]:
+        """Journals rotacionados por uma compactação que não terminou"""
+        return sorted(glob.glob(self.journal_path + '.*.compactando'))
+
+    def carregar(self) -> int:
+        """Monta o índice (snapshot + journals pendentes) e retorna quantos jobs existem"""
+        with self._lock:
+            self._migrar_legado()
+            self._indice = {}
+            self._indexar_snapshot()
+            for caminho in self._rotacionados():
+                self._indexar_journal(caminho)
+            # Eventos deixados por execuções anteriores também contam para a compactação
+            self._eventos = self._indexar_journal(self.journal_path)
+            return len(self._indice)
+
+    def tem(self, job_id: str) -> bool:
+        return job_id in self._indice
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._indice)
+
+    def quantidade(self) -> int:
+        return len(self._indice)
+
+    def resumo(self, job_id: str) -> Dict:
+        """Resumo do job guardado no índice (KeyError se não existe)"""
+        return self._indice[job_id]['resumo']
+
+    def persistido(self, job_id: str) -> bool:
+        """Job com os produtos finais já gravados (pode sair da memória)"""
+        entrada = self._indice.get(job_id)
+        return entrada is not None and entrada['produtos'] is not None
+
+    def ler(self, job_id: str) -> Dict:
+        """Job completo (metadados + lista de dicts de produtos) lido do disco; KeyError se não existe"""
+        with self._lock:
+            entrada = self._indice[job_id]
+            bruto_meta = _ler_local(entrada['meta'])
+            bruto_produtos = None
+            if entrada['produtos'] is not None and entrada['produtos'] != entrada['meta']:
+                bruto_produtos = _ler_local(entrada['produtos'])
+        # Decodifica fora do lock: escritas do journal não esperam pelo JSON dos produtos
+        meta = json.loads(bruto_meta)
+        # Linha do snapshot é o job inteiro; linha do journal é um evento
+        dados = dict(meta.get('dados') or {}) if 'op' in meta else meta
+        produtos_de = dados.pop('produtos_de', None)
+        if bruto_produtos is not None:
+            evento = json.loads(bruto_produtos)
+            produtos_de = evento.get('de')
+            dados['produtos'] = evento.get('produtos') or []
+        else:
+            dados.setdefault('produtos', [])
+        if produtos_de:
+            # Seguidor gravado por referência: os produtos são os do job de origem
+            try:
+                dados['produtos'] = self.ler(produtos_de)['produtos']
+            except KeyError:
+                dados['produtos'] = []
+        return dados
+
+    # ---------- Escrita ----------
+
+    def _abrir(self):
+        pasta = os.path.dirname(os.path.abspath(self.journal_path))
+        os.makedirs(pasta, exist_ok=True)
+        self._arquivo = open(self.journal_path, 'ab')
+        # Linha cortada por um crash: começa a próxima numa linha nova
+        if self._arquivo.tell() > 0:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._arquivo.write(b'\n')
+
+    def _escrever(self, eventos: List[Dict]):
+        with self._lock:
+            if self._arquivo is None:
+                self._abrir()
+            offset = self._arquivo.tell()
+            linhas = [_linha(e) for e in eventos]
+            self._arquivo.write(b''.join(linhas))
+            self._arquivo.flush()
+            for evento, linha in zip(eventos, linhas):
+                self._indexar_evento(evento, Local(self.journal_path, offset, len(linha)))
+                offset += len(linha)
+            self._eventos += len(eventos)
+        self._garantir_thread()
+
+    def salvar(self, job_id: str, dados: Dict, produtos: Optional[Callable[[], List[Dict]]] = None,
+               produtos_de: Optional[str] = None):
+        """Registra o estado do job; ``produtos`` (callable) só é gravado uma vez, ao final.
+
+        Com ``produtos_de`` (job cujos produtos este compartilha) grava só a
+        referência no lugar da lista.
+        """
+        meta = {k: v for k, v in dados.items() if k != 'produtos'}
+        eventos = [{'op': 'job', 'id': job_id, 'dados': meta}]
+        finalizado = dados.get('status') in ('completed', 'cancelled', 'failed')
+        if produtos is not None and finalizado and not self.persistido(job_id):
+            if produtos_de:
+                eventos.append({'op': 'produtos', 'id': job_id, 'de': produtos_de})
+            else:
+                eventos.append({'op': 'produtos', 'id': job_id, 'produtos': produtos()})
+        try:
+            self._escrever(eventos)
+        except OSError as e:
+            print(f"Aviso: falha ao gravar journal de jobs: {e}")
+
+    def materializar(self, job_id: str, produtos: List[Dict]):
+        """Grava a lista completa de um job gravado por referência (o job de origem vai sumir)"""
+        if not self.tem(job_id):
+            return
+        try:
+            self._escrever([{'op': 'produtos', 'id': job_id, 'produtos': produtos}])
+        except OSError as e:
+            print(f"Aviso: falha ao gravar journal de jobs: {e}")
+
+    def remover(self, job_id: str):
+        try:
+            self._escrever([{'op': 'del', 'id': job_id}])
+        except OSError as e:
+            print(f"Aviso: falha ao gravar journal de jobs: {e}")
+
+    # ---------- Compactação ----------
+
+    def _escrever_snapshot(self, jobs: Iterable[Tuple[Dict, Optional[bytes]]]) -> Tuple[str, List]:
+        """Grava (dados, linha já serializada ou None) num snapshot temporário; retorna (tmp, índice)"""
+        tmp = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        pasta = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(pasta, exist_ok=True)
+        entradas = []
+        offset = 0
+        with open(tmp, 'wb') as f:
+            for dados, linha in jobs:
+                if linha is None:
+                    linha = _linha(dados)
+                f.write(linha)
+                if dados.get('job_id'):
+                    entradas.append([dados['job_id'], offset, len(linha), resumo_job(dados)])
+                offset += len(linha)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp, entradas
+
+    def _consolidar(self, rotacionados: List[str]) -> Iterator[Tuple[Dict, Optional[bytes]]]:
+        """Snapshot atual + journals rotacionados, um job por vez (só o journal fica em memória)"""
+        eventos: Dict[str, List[Dict]] = {}
+        for caminho in rotacionados:
+            for evento in _ler_jsonl(caminho):
+                eventos.setdefault(evento.get('id'), []).append(evento)
+        for _, linha in _linhas(self.snapshot_path):
+            try:
+                dados = json.loads(linha)
+            except ValueError:
+                continue
+            job_id = dados.get('job_id')
+            if job_id not in eventos:
+                yield dados, linha  # job sem mudanças: a linha é copiada como está
+                continue
+            jobs = {job_id: dados}
+            for evento in eventos.pop(job_id):
+                _aplicar(jobs, evento)
+            if job_id in jobs:
+                yield jobs[job_id], None
+        # Jobs criados depois do snapshot anterior
+        for job_id, lista in eventos.items():
+            jobs: Dict[str, Dict] = {}
+            for evento in lista:
+                _aplicar(jobs, evento)
+            if job_id in jobs:
+                yield jobs[job_id], None
+
+    def compactar(self) -> bool:
+        """Consolida snapshot + journal num snapshot novo. Retorna True se compactou."""
+        with self._compactando:
+            with self._lock:
+                if self._eventos == 0 and not self._rotacionados():
+                    return False
+                # Rotaciona o journal: novas escritas vão para um arquivo vazio
+                if self._arquivo is not None:
+                    self._arquivo.close()
+                    self._arquivo = None
+                if os.path.exists(self.journal_path):
+                    # Nome ordenável no tempo: a reconstrução aplica os rotacionados em ordem
+                    rotacionado = f"{self.journal_path}.{time.time_ns():020d}.compactando"
+                    os.replace(self.journal_path, rotacionado)
+                    self._renomear_locais(self.journal_path, rotacionado)
+                self._eventos = 0
+            rotacionados = self._rotacionados()
+            tmp, entradas = self._escrever_snapshot(self._consolidar(rotacionados))
+            with self._lock:
+                os.replace(tmp, self.snapshot_path)
+                self._apontar_snapshot(entradas)
+            self._gravar_indice(entradas)
+            # Só depois do snapshot trocado os journals antigos podem sumir
+            for caminho in rotacionados:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+            return True
+
+    def _garantir_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name="job-journal", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo):
+            if self._eventos >= self.compactar_a_cada:
+                try:
+                    self.compactar()
+                except Exception as e:
+                    print(f"Aviso: falha na compactação do journal: {e}")
+
+    def fechar(self):
+        self._parar.set()
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def estado(self) -> Dict:
+        def _tamanho(caminho):
+            try:
+                return os.path.getsize(caminho)
+            except OSError:
+                return 0
+        return {
+            'snapshot': self.snapshot_path,
+            'snapshot_bytes': _tamanho(self.snapshot_path),
+            'journal_bytes': _tamanho(self.journal_path),
+            'eventos_desde_compactacao': self._eventos,
+            'jobs_indexados': len(self._indice),
+        }
+
+
+# Instância global
+job_journal = JobJournal()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+🗂️ Scheduler de Jobs
+Fila de prioridade com pool fixo de workers no event loop do fetch engine.
+
+- Pool fixo de workers (SCRAPER_WORKERS)
+- Prioridade por job (maior = mais urgente), FIFO entre iguais
+- Justiça entre sites: rodízio entre as filas de cada site e limite de
+  jobs simultâneos por site (SCRAPER_MAX_JOBS_PER_SITE)
+- Cancelamento cooperativo: os jobs dormem via ``dormir`` e checam
+  ``verificar`` entre páginas, então um cancelamento interrompe os back-offs
+"""
+
+import os
+import asyncio
+import heapq
+import itertools
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from fetch_engine import fetch_engine
+
+
+class JobCancelado(Exception):
+    """Levantada dentro do job quando ele foi cancelado"""
+
+
+class Cancelamento:
+    """Sinal de cancelamento de um job (pode ser acionado de qualquer thread)"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._evento = asyncio.Event()
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+        self._loop.call_soon_threadsafe(self._evento.set)
+
+    def verificar(self):
+        if self.cancelado:
+            raise JobCancelado()
+
+    async def dormir(self, segundos: float):
+        """Sleep que acorda imediatamente se o job for cancelado"""
+        self.verificar()
+        try:
+            await asyncio.wait_for(self._evento.wait(), timeout=max(0.0, segundos))
+        except asyncio.TimeoutError:
+            return
+        self.verificar()
+
+
+class JobAgendado:
+    def __init__(self, job_id: str, site: str, prioridade: int, seq: int,
+                 fabrica: Callable[[], Awaitable]):
+        self.job_id = job_id
+        self.site = site
+        self.prioridade = prioridade
+        self.seq = seq
+        self.fabrica = fabrica
+        self.cancelamento: Optional[Cancelamento] = None
+
+    def __lt__(self, outro: "JobAgendado") -> bool:
+        return (-self.prioridade, self.seq) < (-outro.prioridade, outro.seq)
+
+
+class JobScheduler:
+    """Fila de prioridade com justiça por site e pool fixo de workers"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.num_workers = max(1, int(os.environ.get("SCRAPER_WORKERS", "4")))
+        # Por padrão sempre sobra ao menos um worker para outros sites
+        padrao_por_site = max(1, self.num_workers - 1)
+        self.max_por_site = max(1, int(os.environ.get("SCRAPER_MAX_JOBS_PER_SITE", str(padrao_por_site))))
+        self._lock = threading.Lock()
+        self._filas: Dict[str, List[JobAgendado]] = {}
+        self._rodizio: Deque[str] = deque()
+        self._na_fila: Dict[str, JobAgendado] = {}
+        self._ativos: Dict[str, JobAgendado] = {}
+        self._rodando_por_site: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._evento: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    # ---------- API (qualquer thread) ----------
+
+    def submeter(self, job_id: str, site: str, fabrica: Callable[[], Awaitable], prioridade: int = 5):
+        """Enfileira um job; ``fabrica`` cria a corrotina quando um worker pegar o job"""
+        item = JobAgendado(job_id, site, prioridade, next(self._seq), fabrica)
+        with self._lock:
+            heapq.heappush(self._filas.setdefault(site, []), item)
+            if site not in self._rodizio:
+                self._rodizio.append(site)
+            self._na_fila[job_id] = item
+        self._garantir_workers()
+        self._acordar()
+
+    def posicao(self, job_id: str) -> Optional[Tuple[int, int]]:
+        """(posição, total na fila) de um job ainda não iniciado"""
+        with self._lock:
+            item = self._na_fila.get(job_id)
+            if item is None:
+                return None
+            ordem = sorted(self._na_fila.values())
+            return ordem.index(item) + 1, len(ordem)
+
+    def cancelar(self, job_id: str) -> Optional[str]:
+        """Cancela um job. Retorna 'fila', 'rodando' ou None se não encontrado"""
+        with self._lock:
+            item = self._na_fila.pop(job_id, None)
+            if item is not None:
+                fila = self._filas.get(item.site, [])
+                fila.remove(item)
+                heapq.heapify(fila)
+                return 'fila'
+            item = self._ativos.get(job_id)
+        if item is not None and item.cancelamento is not None:
+            item.cancelamento.cancelar()
+            return 'rodando'
+        return None
+
+    def cancelamento(self, job_id: str) -> Optional[Cancelamento]:
+        item = self._ativos.get(job_id)
+        return item.cancelamento if item else None
+
+    def estado(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.num_workers,
+                'max_por_site': self.max_por_site,
+                'na_fila': len(self._na_fila),
+                'fila_por_site': {site: len(f) for site, f in self._filas.items() if f},
+                'rodando': len(self._ativos),
+                'rodando_por_site': {s: n for s, n in self._rodando_por_site.items() if n},
+            }
+
+    # ---------- Uso dentro dos jobs (loop do engine) ----------
+
+    async def dormir(self, job_id: str, segundos: float):
+        canc = self.cancelamento(job_id)
+        if canc is None:
+            await asyncio.sleep(segundos)
+        else:
+            await canc.dormir(segundos)
+
+    def verificar(self, job_id: str):
+        canc = self.cancelamento(job_id)
+        if canc is not None:
+            canc.verificar()
+
+    # ---------- Workers ----------
+
+    def _garantir_workers(self):
+        if self._workers:
+            return
+
+        async def _iniciar():
+            if self._workers:
+                return
+            self._evento = asyncio.Event()
+            self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.num_workers)]
+
+        self.engine.submit(_iniciar())
+
+    async def encerrar(self):
+        """Para os workers (shutdown da API; roda no loop do engine).
+
+        Jobs em execução são interrompidos; a fila é mantida e o próximo
+        ``submeter`` cria workers novos.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._evento = None
+
+    def _acordar(self):
+        if self._evento is not None:
+            self.engine.loop.call_soon_threadsafe(self._evento.set)
+
+    def _proximo(self) -> Optional[JobAgendado]:
+        """Escolhe o próximo job: maior prioridade entre os sites elegíveis, rodízio no empate"""
+        with self._lock:
+            escolhido = None
+            for site in self._rodizio:
+                fila = self._filas.get(site)
+                if not fila or self._rodando_por_site.get(site, 0) >= self.max_por_site:
+                    continue
+                if escolhido is None or fila[0].prioridade > escolhido.prioridade:
+                    escolhido = fila[0]
+            if escolhido is None:
+                return None
+            heapq.heappop(self._filas[escolhido.site])
+            del self._na_fila[escolhido.job_id]
+            # Site atendido vai para o fim do rodízio
+            self._rodizio.remove(escolhido.site)
+            self._rodizio.append(escolhido.site)
+            self._rodando_por_site[escolhido.site] = self._rodando_por_site.get(escolhido.site, 0) + 1
+            escolhido.cancelamento = Cancelamento(asyncio.get_running_loop())
+            self._ativos[escolhido.job_id] = escolhido
+            return escolhido
+
+    async def _worker(self):
+        while True:
+            item = self._proximo()
+            if item is None:
+                self._evento.clear()
+                await self._evento.wait()
+                continue
+            try:
+                await item.fabrica()
+            except Exception as e:
+                print(f"Aviso: job {item.job_id} terminou com erro no scheduler: {e}")
+            finally:
+                with self._lock:
+                    self._ativos.pop(item.job_id, None)
+                    self._rodando_por_site[item.site] -= 1
+                # Vaga liberada: outros workers podem estar esperando por este site
+                self._evento.set()
+
+
+# Instância global
+job_scheduler = JobScheduler(fetch_engine)
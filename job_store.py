@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+🗂️ Armazém de Jobs
+Mapeamento job_id -> dados do job com carga preguiçosa. A API sobe só com o
+índice do journal (resumos); o job completo — metadados e produtos — é lido
+do disco no primeiro acesso. Um LRU limita quantos jobs completos ficam em
+memória; jobs em andamento ou com produtos ainda não gravados nunca saem.
+
+Configuração via ambiente:
+  SCRAPER_JOBS_RESIDENT="32" -> jobs completos mantidos em memória
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional
+
+from job_journal import JobJournal, resumo_job
+from result_store import ResultadosColunares
+
+
+STATUS_FINAIS = ('completed', 'cancelled', 'failed')
+
+
+class ArmazemJobs(MutableMapping):
+    """dict de jobs sobre o journal: ``in``/``len``/iteração usam só o índice.
+
+    ``del armazem[job_id]`` também registra a remoção no journal; gravar o
+    estado do job continua explícito (``JobJournal.salvar``).
+    """
+
+    def __init__(self, journal: JobJournal, max_residentes: Optional[int] = None):
+        self.journal = journal
+        self.max_residentes = max(1, int(max_residentes or os.environ.get("SCRAPER_JOBS_RESIDENT", "32")))
+        self._residentes: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.carregados_do_disco = 0
+
+    def __contains__(self, job_id) -> bool:
+        return job_id in self._residentes or self.journal.tem(job_id)
+
+    def __getitem__(self, job_id: str) -> Dict:
+        with self._lock:
+            dados = self._residentes.get(job_id)
+            if dados is not None:
+                self._residentes.move_to_end(job_id)
+                return dados
+        dados = self.journal.ler(job_id)  # KeyError se o job não existe
+        dados['produtos'] = ResultadosColunares.de_dicts(dados['produtos'])
+        with self._lock:
+            if job_id not in self:
+                raise KeyError(job_id)  # removido enquanto era lido
+            # Outra thread pode ter carregado o mesmo job enquanto este lia o disco
+            dados = self._residentes.setdefault(job_id, dados)
+            self._residentes.move_to_end(job_id)
+            self.carregados_do_disco += 1
+            self._despejar()
+            return dados
+
+    def __setitem__(self, job_id: str, dados: Dict):
+        with self._lock:
+            self._residentes[job_id] = dados
+            self._residentes.move_to_end(job_id)
+            self._despejar()
+
+    def __delitem__(self, job_id: str):
+        with self._lock:
+            residente = self._residentes.pop(job_id, None)
+            if residente is None and not self.journal.tem(job_id):
+                raise KeyError(job_id)
+        self.journal.remover(job_id)
+
+    def _extras(self):
+        """Residentes que ainda não chegaram ao journal"""
+        return [job_id for job_id in list(self._residentes) if not self.journal.tem(job_id)]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.journal.ids()
+        yield from self._extras()
+
+    def __len__(self) -> int:
+        return self.journal.quantidade() + len(self._extras())
+
+    def _despejar(self):
+        excesso = len(self._residentes) - self.max_residentes
+        if excesso <= 0:
+            return
+        for job_id in list(self._residentes):
+            if excesso <= 0:
+                break
+            if self._residentes[job_id].get('status') in STATUS_FINAIS and self.journal.persistido(job_id):
+                del self._residentes[job_id]
+                excesso -= 1
+
+    # ---------- Resumos (sem ler jobs do disco) ----------
+
+    def resumo(self, job_id: str) -> Dict:
+        """Campos de listagem do job: do dict residente (ao vivo) ou do índice"""
+        dados = self._residentes.get(job_id)
+        if dados is not None:
+            return resumo_job(dados)
+        return self.journal.resumo(job_id)
+
+    def resumos(self) -> Iterator[Dict]:
+        for job_id in self:
+            try:
+                yield self.resumo(job_id)
+            except KeyError:
+                continue  # removido durante a iteração
+
+    def estado(self) -> Dict:
+        return {
+            'residentes': len(self._residentes),
+            'max_residentes': self.max_residentes,
+            'carregados_do_disco': self.carregados_do_disco,
+        }
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+⏱️ Tempos por Etapa
+Cronômetro leve por job: cada etapa (aquecimento da sessão, esperas, rede,
+detecção de bloqueio, parsing, extração...) é medida com perf_counter e
+somada por página e no total do job.
+
+O cronômetro do job fica num ContextVar, então as tarefas criadas pelo job
+(downloads em paralelo, produtor do pipeline) e o fetch_engine medem sem
+receber o job como parâmetro; fora de um job, ``medir`` não faz nada.
+
+Os tempos são exclusivos: uma etapa aberta dentro de outra (ex: 'rede'
+dentro de 'aquecimento_sessao') desconta seu tempo da etapa de fora, então
+a soma das etapas não conta nada duas vezes. O tempo inclusivo de cada
+etapa também é informado.
+
+Configuração via ambiente:
+  SCRAPER_TRACE_FILE=""  -> se definido, cada job encerrado acrescenta uma linha JSON com seus tempos
+"""
+
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+# Etapas em que o job está parado de propósito (delays, backoff, rate limit, comportamento humano)
+ETAPAS_ESPERA = frozenset({'espera_delay', 'espera_backoff', 'espera_rate', 'espera_humana'})
+
+_cronometro: ContextVar[Optional["Cronometro"]] = ContextVar('cronometro_job', default=None)
+_pagina: ContextVar[Optional[int]] = ContextVar('pagina_job', default=None)
+# Tempo já atribuído a etapas filhas da etapa aberta
+_aberta: ContextVar[Optional[List[float]]] = ContextVar('etapa_aberta', default=None)
+
+
+class Cronometro:
+    """Soma dos tempos por etapa de um job (total e por página)"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self._lock = threading.Lock()
+        # etapa -> [exclusivo, inclusivo, ocorrências]
+        self._etapas: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0, 0])
+        # página -> etapa -> exclusivo
+        self._paginas: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def adicionar(self, etapa: str, exclusivo: float, inclusivo: Optional[float] = None,
+                  pagina: Optional[int] = None):
+        with self._lock:
+            acumulado = self._etapas[etapa]
+            acumulado[0] += exclusivo
+            acumulado[1] += exclusivo if inclusivo is None else inclusivo
+            acumulado[2] += 1
+            if pagina is not None:
+                self._paginas[pagina][etapa] += exclusivo
+
+    def encerrar(self):
+        if self.fim is None:
+            self.fim = time.perf_counter()
+
+    def resumo(self) -> Dict:
+        """Tempos em segundos: total do job, dormindo x trabalhando, por etapa e por página"""
+        with self._lock:
+            etapas = {e: list(v) for e, v in self._etapas.items()}
+            paginas = {p: dict(v) for p, v in self._paginas.items()}
+        dormindo = sum(v[0] for e, v in etapas.items() if e in ETAPAS_ESPERA)
+        trabalhando = sum(v[0] for e, v in etapas.items() if e not in ETAPAS_ESPERA)
+        return {
+            'duracao_s': round((self.fim or time.perf_counter()) - self.inicio, 4),
+            # Páginas em paralelo se sobrepõem: as somas podem passar da duração
+            'dormindo_s': round(dormindo, 4),
+            'trabalhando_s': round(trabalhando, 4),
+            'etapas': {
+                e: {'s': round(v[0], 4), 'inclusivo_s': round(v[1], 4), 'n': v[2]}
+                for e, v in sorted(etapas.items(), key=lambda item: -item[1][0])
+            },
+            'paginas': {
+                str(p): {e: round(s, 4) for e, s in sorted(v.items())}
+                for p, v in sorted(paginas.items())
+            },
+        }
+
+
+@contextmanager
+def cronometrar(cronometro: Cronometro) -> Iterator[Cronometro]:
+    """Torna ``cronometro`` o cronômetro do contexto atual (e das tarefas criadas dentro dele)"""
+    token = _cronometro.set(cronometro)
+    try:
+        yield cronometro
+    finally:
+        _cronometro.reset(token)
+
+
+def marcar_pagina(pagina: int):
+    """Página à qual as etapas medidas nesta tarefa são atribuídas"""
+    _pagina.set(pagina)
+
+
+@contextmanager
+def medir(etapa: str, pagina: Optional[int] = None):
+    """Mede o bloco como ``etapa`` no cronômetro do job atual (no-op fora de um job)"""
+    cronometro = _cronometro.get()
+    if cronometro is None:
+        yield
+        return
+    externa = _aberta.get()
+    filhas = [0.0]
+    token = _aberta.set(filhas)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        _aberta.reset(token)
+        if externa is not None:
+            externa[0] += duracao
+        cronometro.adicionar(etapa, duracao - filhas[0], duracao,
+                             pagina if pagina is not None else _pagina.get())
+
+
+def registrar(etapa: str, segundos: float, pagina: Optional[int] = None):
+    """Acrescenta um tempo medido fora do processo/thread (ex: parsing no pool) ao job atual"""
+    cronometro = _cronometro.get()
+    if cronometro is None:
+        return
+    externa = _aberta.get()
+    if externa is not None:
+        externa[0] += segundos
+    cronometro.adicionar(etapa, segundos, pagina=pagina if pagina is not None else _pagina.get())
+
+
+class ArquivoTrace:
+    """Linhas JSON com os tempos de cada job encerrado (SCRAPER_TRACE_FILE)"""
+
+    def __init__(self):
+        self.caminho = os.environ.get("SCRAPER_TRACE_FILE", "")
+        self._lock = threading.Lock()
+
+    def gravar(self, registro: Dict):
+        if not self.caminho:
+            return
+        linha = json.dumps(registro, ensure_ascii=False) + '\n'
+        try:
+            with self._lock, open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write(linha)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o trace em {self.caminho}: {e}")
+
+
+# Instância global
+arquivo_trace = ArquivoTrace()
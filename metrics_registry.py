@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+📈 Registro de Métricas
+Métricas em processo atualizadas de forma incremental nos pontos onde os
+eventos acontecem (download, parsing, bloqueio, mudança de status), expostas
+no formato texto do Prometheus. Um scrape custa O(séries), não O(jobs).
+
+Tipos: contador, medidor (gauge, com valor fixo ou calculado na hora da
+coleta) e histograma com buckets cumulativos.
+"""
+
+import math
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(nomes: Sequence[str], valores: Tuple, extra: str = '') -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        partes.append(extra)
+    return '{' + ','.join(partes) + '}' if partes else ''
+
+
+def _numero(valor: float) -> str:
+    if valor == math.inf:
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class _Metrica:
+    tipo = ''
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict) -> Tuple:
+        return tuple(str(rotulos.get(n, '')) for n in self.rotulos)
+
+    def linhas(self) -> List[str]:
+        return [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} {self.tipo}'] + self._amostras()
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Contador(_Metrica):
+    tipo = 'counter'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Tuple, float] = {}
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valores(self) -> Dict[Tuple, float]:
+        with self._lock:
+            return dict(self._valores)
+
+    def _amostras(self) -> List[str]:
+        return [f'{self.nome}{_rotulos(self.rotulos, k)} {_numero(v)}' for k, v in sorted(self.valores().items())]
+
+
+class Medidor(_Metrica):
+    """Gauge: valor mantido (set/inc/dec) ou calculado na coleta (``funcao`` -> {rótulos: valor})"""
+    tipo = 'gauge'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                 funcao: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Tuple, float] = {}
+        self.funcao = funcao
+
+    def set(self, valor: float, **rotulos):
+        with self._lock:
+            self._valores[self._chave(rotulos)] = valor
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def dec(self, valor: float = 1, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def valores(self) -> Dict[Tuple, float]:
+        if self.funcao is not None:
+            return self.funcao()
+        with self._lock:
+            return dict(self._valores)
+
+    def _amostras(self) -> List[str]:
+        return [f'{self.nome}{_rotulos(self.rotulos, k)} {_numero(v)}' for k, v in sorted(self.valores().items())]
+
+
+class Histograma(_Metrica):
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, ajuda: str, buckets: Iterable[float], rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # rótulos -> [contagem por bucket (não cumulativa), soma, total]
+        self._series: Dict[Tuple, list] = {}
+
+    def observar(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        # Primeiro bucket com limite >= valor (busca linear: poucos buckets)
+        indice = next(i for i, limite in enumerate(self.buckets) if valor <= limite)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * len(self.buckets), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def resumo(self) -> Dict[Tuple, Tuple[int, float]]:
+        """rótulos -> (observações, soma)"""
+        with self._lock:
+            return {k: (s[2], s[1]) for k, s in self._series.items()}
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            series = {k: ([*s[0]], s[1], s[2]) for k, s in self._series.items()}
+        linhas = []
+        for chave, (contagens, soma, total) in sorted(series.items()):
+            acumulado = 0
+            for limite, n in zip(self.buckets, contagens):
+                acumulado += n
+                le = 'le="' + _numero(limite) + '"'
+                linhas.append(f'{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {acumulado}')
+            linhas.append(f'{self.nome}_sum{_rotulos(self.rotulos, chave)} {_numero(soma)}')
+            linhas.append(f'{self.nome}_count{_rotulos(self.rotulos, chave)} {total}')
+        return linhas
+
+
+class RegistroMetricas:
+    """Conjunto de métricas expostas juntas no /metrics/prometheus"""
+
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas.append(metrica)
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self.registrar(Contador(nome, ajuda, rotulos))
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), funcao=None) -> Medidor:
+        return self.registrar(Medidor(nome, ajuda, rotulos, funcao))
+
+    def histograma(self, nome: str, ajuda: str, buckets: Iterable[float], rotulos: Sequence[str] = ()) -> Histograma:
+        return self.registrar(Histograma(nome, ajuda, buckets, rotulos))
+
+    def texto(self) -> str:
+        """Formato de exposição texto do Prometheus (0.0.4)"""
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.linhas())
+        return '\n'.join(linhas) + '\n'
+
+
+class EstatisticasJobs:
+    """Contagem de jobs por status e distribuição de total_produtos, mantidas a cada mudança"""
+
+    def __init__(self, medidor_status: Medidor):
+        self.medidor_status = medidor_status
+        self._lock = threading.Lock()
+        self.por_status: Counter = Counter()
+        # total_produtos -> número de jobs (min/max exatos mesmo com remoções)
+        self.totais: Counter = Counter()
+
+    def _aplicar(self, status: Optional[str], total: Optional[int], sinal: int):
+        if status is not None:
+            self.por_status[status] += sinal
+            self.medidor_status.inc(sinal, status=status)
+        if total is not None:
+            self.totais[total] += sinal
+            if self.totais[total] <= 0:
+                del self.totais[total]
+
+    def trocar(self, antes: Tuple[Optional[str], Optional[int]], depois: Tuple[Optional[str], Optional[int]]):
+        """(status, total_produtos) antigos -> novos; (None, None) = job inexistente"""
+        with self._lock:
+            self._aplicar(*antes, -1)
+            self._aplicar(*depois, +1)
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            n = sum(self.totais.values())
+            medias = None
+            if n:
+                medias = {
+                    'media_produtos_por_job': sum(t * c for t, c in self.totais.items()) / n,
+                    'max_produtos': max(self.totais),
+                    'min_produtos': min(self.totais)
+                }
+            return {
+                'total_jobs': sum(self.por_status.values()),
+                'concluidos': self.por_status['completed'],
+                'falhados': self.por_status['failed'],
+                'rodando': self.por_status['running'],
+                'medias': medias
+            }
+
+
+# Buckets padrão
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BUCKETS_BYTES = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_000_000, 5_000_000)
+
+# Instância global
+metricas = RegistroMetricas()
+
+JOBS_POR_STATUS = metricas.medidor('scraper_jobs', 'Jobs por status', ('status',))
+estatisticas_jobs = EstatisticasJobs(JOBS_POR_STATUS)
+PAGINAS_BAIXADAS = metricas.contador(
+    'scraper_paginas_baixadas_total', 'Páginas obtidas por site e origem (rede/cache)', ('site', 'origem'))
+RESPOSTAS_HTTP = metricas.contador(
+    'scraper_http_respostas_total', 'Respostas HTTP recebidas por site e status', ('site', 'status'))
+BLOQUEIOS = metricas.contador(
+    'scraper_bloqueios_total', 'Bloqueios/captchas detectados por site e motivo', ('site', 'motivo'))
+FALHAS_PROXY = metricas.contador(
+    'scraper_falhas_proxy_total', 'Erros de rede/proxy em requisições', ('site',))
+PRODUTOS_EXTRAIDOS = metricas.contador(
+    'scraper_produtos_extraidos_total', 'Produtos extraídos por site', ('site',))
+LATENCIA_FETCH = metricas.histograma(
+    'scraper_fetch_segundos', 'Latência das requisições HTTP', BUCKETS_SEGUNDOS, ('site',))
+LATENCIA_PARSE = metricas.histograma(
+    'scraper_parse_segundos', 'Tempo de parsing/extração por página', BUCKETS_SEGUNDOS, ('site',))
+TAMANHO_PAGINA = metricas.histograma(
+    'scraper_pagina_bytes', 'Tamanho das páginas baixadas', BUCKETS_BYTES, ('site',))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🧩 Parsing de Páginas de Resultado
+Parsing + extração de produtos de uma página, isolados do resto da API para
+poder rodar em um ProcessPoolExecutor (o BeautifulSoup segura o GIL).
+
+Os workers recebem os bytes crus da página e o conjunto de seletores do site
+(SITES_SUPORTADOS[...]["seletores"]) e devolvem tuplas simples, que são
+baratas de serializar entre processos.
+
+O parser (selectolax/lxml/bs4) é escolhido em parser_backends.
+
+Configuração via ambiente:
+  SCRAPER_PARSE_WORKERS="0"   -> 0 = thread no próprio processo; N = pool com N processos
+  SCRAPER_PARSE_REGIONS="1"   -> no bs4, monta árvore só para as subárvores dos itens (quando possível)
+"""
+
+import os
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from parser_backends import escolher_backend, iterar_regioes, parse_html
+
+
+# Fallback para variações de layout (por nome do site)
+SELETORES_ALTERNATIVOS = {
+    'Mercado Livre': [
+        'div.ui-search-result__wrapper',
+        'div.ui-search-result',
+        'li.ui-search-layout__item shops__layout-item',
+        'div.poly-card'
+    ]
+}
+
+# Lido também pelos workers do pool (spawn herda o ambiente)
+PARSE_POR_REGIAO = os.environ.get("SCRAPER_PARSE_REGIONS", "1") == "1"
+
+# Domínio usado para completar links relativos
+DOMINIOS_LINK = {
+    'Mercado Livre': "https://www.mercadolivre.com.br",
+    'Amazon': "https://www.amazon.com.br",
+}
+
+
+# Campos extraídos de cada item, na ordem das tuplas devolvidas pelos workers
+CAMPOS = ('nome', 'preco', 'link', 'avaliacao', 'reviews', 'centavos')
+
+
+class ResultadoPagina(NamedTuple):
+    """Resultado da extração de uma página (picklable)"""
+    produtos: List[Tuple[Optional[str], ...]]  # (nome, preco, link, avaliacao, reviews, centavos)
+    seletor_principal_hits: int
+    fallback_usado: Optional[str]
+    parser: str
+    # (parsing, extração) em segundos, medidos no worker
+    tempos: Tuple[float, float] = (0.0, 0.0)
+
+
+class PlanoExtracao:
+    """Plano compilado a partir dos seletores de um site.
+
+    Seletores repetidos entre campos (no ML, nome e link usam o mesmo) viram uma
+    única consulta, e todos os campos de um item saem de uma passada só.
+    Os centavos são procurados junto do nó do preço (no mesmo elemento de
+    valor), não no item inteiro: um item com preço antigo e preço atual não
+    mistura a parte inteira de um com os centavos do outro.
+    """
+
+    def __init__(self, seletores: Dict[str, str], nome_site: str):
+        self.distintos: List[str] = []
+        # campo -> índice em self.distintos
+        self.indices: Dict[str, int] = {}
+        self.seletor_centavos = seletores.get('centavos') if seletores.get('preco') else None
+        for campo in CAMPOS:
+            sel = seletores.get(campo)
+            if not sel or (campo == 'centavos' and self.seletor_centavos):
+                continue
+            if sel not in self.distintos:
+                self.distintos.append(sel)
+            self.indices[campo] = self.distintos.index(sel)
+        self.dominio_link = DOMINIOS_LINK.get(nome_site)
+
+    def extrair(self, item) -> Tuple[Optional[str], ...]:
+        nos = item.primeiros(self.distintos)
+        textos: Dict[int, str] = {}
+        valores = []
+        for campo in CAMPOS:
+            i = self.indices.get(campo)
+            no = nos[i] if i is not None else None
+            if campo == 'centavos' and self.seletor_centavos:
+                valores.append(self._centavos(nos[self.indices['preco']]))
+                continue
+            if no is None:
+                valores.append(None)
+            elif campo == 'link':
+                link = no.get('href') or None
+                if link and link.startswith('/') and self.dominio_link:
+                    link = f"{self.dominio_link}{link}"
+                valores.append(link)
+            else:
+                if i not in textos:
+                    textos[i] = no.get_text(strip=True)
+                valores.append(textos[i])
+        return tuple(valores)
+
+    def _centavos(self, preco) -> Optional[str]:
+        """Centavos do mesmo elemento de valor que o nó do preço"""
+        valor = preco.pai() if preco is not None else None
+        no = valor.select_one(self.seletor_centavos) if valor is not None else None
+        return no.get_text(strip=True) if no is not None else None
+
+
+@lru_cache(maxsize=64)
+def _plano(seletores: Tuple[Tuple[str, str], ...], nome_site: str) -> PlanoExtracao:
+    return PlanoExtracao(dict(seletores), nome_site)
+
+
+def plano_extracao(seletores: Dict[str, str], nome_site: str) -> PlanoExtracao:
+    """Plano do site (compilado uma vez por processo)"""
+    return _plano(tuple(sorted(seletores.items())), nome_site)
+
+
+def extrair_pagina(conteudo: bytes, seletores: Dict[str, str], nome_site: str,
+                   parser: Optional[str] = None) -> ResultadoPagina:
+    """Faz o parsing de uma página e extrai os CAMPOS de cada item"""
+    alternativos = SELETORES_ALTERNATIVOS.get(nome_site, [])
+    backend = escolher_backend(list(seletores.values()) + alternativos, parser)
+    plano = plano_extracao(seletores, nome_site)
+
+    produtos = []
+    hits = 0
+    fallback = None
+    inicio = time.perf_counter()
+    extracao = 0.0
+    regioes = iterar_regioes(conteudo, seletores['item'], backend) if PARSE_POR_REGIAO else None
+    if regioes is not None:
+        for item in regioes:
+            hits += 1
+            t = time.perf_counter()
+            valores = plano.extrair(item)
+            extracao += time.perf_counter() - t
+            if valores[0]:
+                produtos.append(valores)
+
+    if not hits:
+        # Parsing completo: seletor complexo, backend sem modo por região ou layout alternativo
+        soup = parse_html(conteudo, backend)
+        itens = soup.select(seletores['item']) if regioes is None else []
+        hits = len(itens)
+        if not itens:
+            for sel in alternativos:
+                itens = soup.select(sel)
+                if itens:
+                    fallback = sel
+                    break
+        t = time.perf_counter()
+        for item in itens:
+            valores = plano.extrair(item)
+            if valores[0]:
+                produtos.append(valores)
+        extracao += time.perf_counter() - t
+
+    # No modo por região o parsing acontece à medida que os itens são pedidos
+    parsing = time.perf_counter() - inicio - extracao
+    return ResultadoPagina(produtos, hits, fallback, backend, (parsing, extracao))
+
+
+class ParseStage:
+    """Estágio de parsing: thread local ou pool de processos"""
+
+    def __init__(self):
+        self.workers = max(0, int(os.environ.get("SCRAPER_PARSE_WORKERS", "0")))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: o processo da API tem threads (uvicorn + fetch engine), fork não é seguro
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def extrair(self, conteudo: bytes, seletores: Dict[str, str], nome_site: str,
+                      parser: Optional[str] = None) -> ResultadoPagina:
+        if self.workers > 0:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, extrair_pagina, conteudo, seletores, nome_site, parser)
+        return await asyncio.to_thread(extrair_pagina, conteudo, seletores, nome_site, parser)
+
+    def encerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Instância global
+parse_stage = ParseStage()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+⚡ Backends de Parsing HTML
+Interface mínima (select / select_one / pai / get_text / get) sobre três parsers,
+para que os seletores CSS de SITES_SUPORTADOS rodem sem mudanças em qualquer um:
+
+- selectolax (lexbor): o mais rápido
+- lxml (+ cssselect)
+- bs4: BeautifulSoup com html.parser, o comportamento original
+
+Se um seletor não for suportado pelo backend escolhido (ou a biblioteca não
+estiver instalada), o parsing cai para o BeautifulSoup.
+
+Modo por região (``iterar_regioes``), só no bs4: quando o seletor de item é
+simples (tag, classes e/ou um atributo), um SoupStrainer monta árvore só para
+as subárvores dos itens. No lxml e no selectolax o parsing completo em C já é
+mais rápido que qualquer filtragem feita em Python, então eles não usam.
+
+Configuração via ambiente:
+  SCRAPER_PARSER="auto"   -> auto | selectolax | lxml | bs4 (auto = o mais rápido disponível)
+"""
+
+import os
+import re
+import codecs
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+_RE_CHARSET = re.compile(rb'charset=["\']?([\w-]+)', re.I)
+
+# tag.classe1.classe2[atributo='valor'] (todas as partes opcionais)
+_RE_SELETOR_SIMPLES = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)"
+    r"(?:\[(?P<attr>[\w-]+)=(?P<aspas>['\"]?)(?P<valor>[^'\"\]]+)(?P=aspas)\])?$"
+)
+
+
+class SeletorNaoSuportado(Exception):
+    """Seletor CSS que o backend não consegue compilar"""
+
+
+def _charset(conteudo: bytes) -> str:
+    """Charset declarado no início do documento (padrão utf-8)"""
+    m = _RE_CHARSET.search(conteudo[:4096])
+    if not m:
+        return 'utf-8'
+    try:
+        return codecs.lookup(m.group(1).decode('ascii')).name
+    except LookupError:
+        return 'utf-8'
+
+
+# ---------- bs4 ----------
+
+@lru_cache(maxsize=64)
+def _uniao_bs4(seletores: Tuple[str, ...]):
+    return soupsieve.compile(', '.join(seletores)), [soupsieve.compile(s) for s in seletores]
+
+
+class NoBS4:
+    __slots__ = ('_tag',)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def select(self, seletor: str) -> List["NoBS4"]:
+        return [NoBS4(t) for t in self._tag.select(seletor)]
+
+    def select_one(self, seletor: str) -> Optional["NoBS4"]:
+        t = self._tag.select_one(seletor)
+        return NoBS4(t) if t is not None else None
+
+    def primeiros(self, seletores: Sequence[str]) -> List[Optional["NoBS4"]]:
+        """Primeiro descendente de cada seletor, numa única passada pela subárvore.
+
+        A passada usa a união dos seletores; só os nós que casam com a união são
+        testados contra cada seletor individual.
+        """
+        uniao, compilados = _uniao_bs4(tuple(seletores))
+        achados: List[Optional[NoBS4]] = [None] * len(seletores)
+        faltam = len(seletores)
+        for tag in uniao.iselect(self._tag):
+            for i, comp in enumerate(compilados):
+                if achados[i] is None and comp.match(tag):
+                    achados[i] = NoBS4(tag)
+                    faltam -= 1
+            if not faltam:
+                break
+        return achados
+
+    def pai(self) -> Optional["NoBS4"]:
+        t = self._tag.parent
+        return NoBS4(t) if t is not None else None
+
+    def get_text(self, strip: bool = False) -> str:
+        return self._tag.get_text(strip=strip)
+
+    def get(self, atributo: str, padrao=None):
+        return self._tag.get(atributo, padrao)
+
+    def __getitem__(self, atributo: str):
+        return self._tag[atributo]
+
+
+# ---------- lxml ----------
+
+@lru_cache(maxsize=256)
+def _xpath_lxml(seletor: str):
+    from lxml import etree
+    from cssselect import GenericTranslator, SelectorError
+    try:
+        # descendant:: (e não descendant-or-self::) para ter a mesma semântica do bs4
+        return etree.XPath(GenericTranslator().css_to_xpath(seletor, prefix='descendant::'))
+    except SelectorError as e:
+        raise SeletorNaoSuportado(seletor) from e
+
+
+class NoLxml:
+    __slots__ = ('_el',)
+
+    def __init__(self, el):
+        self._el = el
+
+    def select(self, seletor: str) -> List["NoLxml"]:
+        return [NoLxml(e) for e in _xpath_lxml(seletor)(self._el)]
+
+    def select_one(self, seletor: str) -> Optional["NoLxml"]:
+        achados = _xpath_lxml(seletor)(self._el)
+        return NoLxml(achados[0]) if achados else None
+
+    def primeiros(self, seletores: Sequence[str]) -> List[Optional["NoLxml"]]:
+        # Cada XPath compilado percorre a subárvore em C; a passada em Python não compensa
+        return [self.select_one(s) for s in seletores]
+
+    def pai(self) -> Optional["NoLxml"]:
+        e = self._el.getparent()
+        return NoLxml(e) if e is not None else None
+
+    def get_text(self, strip: bool = False) -> str:
+        if strip:
+            return ''.join(t.strip() for t in self._el.itertext())
+        return ''.join(self._el.itertext())
+
+    def get(self, atributo: str, padrao=None):
+        return self._el.get(atributo, padrao)
+
+    def __getitem__(self, atributo: str):
+        valor = self._el.get(atributo)
+        if valor is None:
+            raise KeyError(atributo)
+        return valor
+
+
+# ---------- selectolax ----------
+
+class NoSelectolax:
+    __slots__ = ('_no',)
+
+    def __init__(self, no):
+        self._no = no
+
+    def select(self, seletor: str) -> List["NoSelectolax"]:
+        try:
+            achados = self._no.css(seletor)
+        except Exception as e:  # SelectolaxError: seletor não suportado pelo lexbor
+            raise SeletorNaoSuportado(seletor) from e
+        # O lexbor inclui o próprio nó no resultado; o bs4 não
+        proprio = self._no.mem_id
+        return [NoSelectolax(n) for n in achados if n.mem_id != proprio]
+
+    def select_one(self, seletor: str) -> Optional["NoSelectolax"]:
+        achados = self.select(seletor)
+        return achados[0] if achados else None
+
+    def primeiros(self, seletores: Sequence[str]) -> List[Optional["NoSelectolax"]]:
+        # O lexbor já casa o seletor em C; uma consulta por seletor distinto
+        return [self.select_one(s) for s in seletores]
+
+    def pai(self) -> Optional["NoSelectolax"]:
+        n = self._no.parent
+        return NoSelectolax(n) if n is not None else None
+
+    def get_text(self, strip: bool = False) -> str:
+        return self._no.text(strip=strip)
+
+    def get(self, atributo: str, padrao=None):
+        valor = self._no.attributes.get(atributo)
+        return padrao if valor is None else valor
+
+    def __getitem__(self, atributo: str):
+        valor = self._no.attributes.get(atributo)
+        if valor is None:
+            raise KeyError(atributo)
+        return valor
+
+
+No = Union[NoBS4, NoLxml, NoSelectolax]
+
+
+# ---------- Escolha do backend ----------
+
+@lru_cache(maxsize=None)
+def disponivel(backend: str) -> bool:
+    try:
+        if backend == 'selectolax':
+            import selectolax.lexbor  # noqa: F401
+        elif backend == 'lxml':
+            import lxml.html  # noqa: F401
+            import cssselect  # noqa: F401
+        return backend in BACKENDS
+    except ImportError:
+        return False
+
+
+@lru_cache(maxsize=512)
+def suporta(backend: str, seletor: str) -> bool:
+    """Testa se o backend entende o seletor (resultado em cache)"""
+    if backend == 'bs4':
+        return True
+    try:
+        parse_html(b'<html><body></body></html>', backend).select(seletor)
+        return True
+    except SeletorNaoSuportado:
+        return False
+
+
+def backend_padrao() -> str:
+    preferido = os.environ.get("SCRAPER_PARSER", "auto").strip().lower()
+    if preferido in BACKENDS and disponivel(preferido):
+        return preferido
+    return next(b for b in BACKENDS if disponivel(b))
+
+
+def escolher_backend(seletores: Iterable[str], preferido: Optional[str] = None) -> str:
+    """Backend que será usado para um conjunto de seletores.
+
+    ``preferido`` vem da config do site (chave "parser"); sem ela vale SCRAPER_PARSER.
+    Cai para bs4 se algum seletor não for suportado.
+    """
+    backend = preferido if preferido in BACKENDS and disponivel(preferido) else backend_padrao()
+    if all(suporta(backend, s) for s in seletores if s):
+        return backend
+    return 'bs4'
+
+
+class SeletorSimples(NamedTuple):
+    tag: Optional[str]
+    classes: Tuple[str, ...]
+    attr: Optional[str]
+    valor: Optional[str]
+
+
+@lru_cache(maxsize=64)
+def seletor_simples(seletor: str) -> Optional[SeletorSimples]:
+    """Decompõe seletores do tipo ``li.s-item`` / ``[data-x='y']``; None se não for simples"""
+    m = _RE_SELETOR_SIMPLES.match(seletor.strip())
+    if not m or not (m.group('tag') or m.group('classes') or m.group('attr')):
+        return None
+    classes = tuple(c for c in m.group('classes').split('.') if c)
+    return SeletorSimples(m.group('tag') and m.group('tag').lower(), classes, m.group('attr'), m.group('valor'))
+
+
+def _regioes_bs4(conteudo: bytes, seletor: str, simples: SeletorSimples) -> Iterator[NoBS4]:
+    attrs = {}
+    if simples.attr:
+        attrs[simples.attr] = simples.valor
+    if simples.classes:
+        # Filtra pela primeira classe; o select abaixo confere o seletor completo.
+        # Regex por palavra: o bs4 4.13+ compara a string inteira do atributo
+        # no strainer, e um valor simples não casa com class="a b"
+        attrs['class'] = re.compile(rf'(?:^|\s){re.escape(simples.classes[0])}(?:\s|$)')
+    strainer = SoupStrainer(simples.tag, attrs=attrs)
+    soup = BeautifulSoup(conteudo, "html.parser", parse_only=strainer)
+    for tag in soup.select(seletor):
+        yield NoBS4(tag)
+
+
+def iterar_regioes(conteudo: bytes, seletor_item: str, backend: str) -> Optional[Iterator[No]]:
+    """Itera só as subárvores que casam com o seletor de item, sem montar o DOM inteiro.
+
+    Retorna None quando o modo por região não se aplica (backend que não é o
+    bs4 ou seletor complexo); nesse caso o chamador faz o parsing completo.
+    """
+    if backend != 'bs4' or not isinstance(conteudo, bytes):
+        return None
+    simples = seletor_simples(seletor_item)
+    if simples is None:
+        return None
+    return _regioes_bs4(conteudo, seletor_item, simples)
+
+
+def parse_html(conteudo: Union[bytes, str], backend: Optional[str] = None) -> No:
+    """Faz o parsing e retorna o nó raiz no backend pedido"""
+    backend = backend or backend_padrao()
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        if isinstance(conteudo, bytes) and _charset(conteudo) != 'utf-8':
+            conteudo = conteudo.decode(_charset(conteudo), errors='replace')
+        return NoSelectolax(LexborHTMLParser(conteudo).root)
+    if backend == 'lxml':
+        import lxml.html
+        if not conteudo.strip():
+            conteudo = b'<html></html>'  # lxml recusa documento vazio
+        if isinstance(conteudo, bytes):
+            parser = lxml.html.HTMLParser(encoding=_charset(conteudo))
+            return NoLxml(lxml.html.document_fromstring(conteudo, parser=parser))
+        return NoLxml(lxml.html.document_fromstring(conteudo))
+    return NoBS4(BeautifulSoup(conteudo, "html.parser"))
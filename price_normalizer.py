@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+💲 Normalização de Preços
+Converte os textos de preço de uma página (ou de um job inteiro) em float64,
+com regras de locale por site e os centavos que os sites mostram em elemento
+separado. Um texto por vez com regex compilada: numa página (~50 preços) isso
+custa bem menos que montar uma Series do pandas.
+
+- pt_BR (ML, Amazon): "1.234" -> 1234.0, "1.234,56" -> 1234.56, "1.234," -> 1234.0
+- en_US (eBay): "$1,234.56" -> 1234.56, "$10.00 to $20.00" -> 10.0
+- com os dois separadores no texto o último é o decimal, em qualquer locale
+  ("$1,234.56" também vale 1234.56 em pt_BR)
+- centavos: "1.234" + "90" -> 1234.90, "12" + "5" -> 12.50 (só quando o preço não tem parte decimal)
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Separadores por locale: (milhar, decimal)
+LOCALES = {
+    'pt_BR': ('.', ','),
+    'en_US': (',', '.'),
+}
+
+LOCALE_PADRAO = 'pt_BR'
+
+# Locale dos sites que não usam o padrão (por nome do site)
+LOCALE_POR_SITE = {
+    'eBay': 'en_US',
+}
+
+# Primeiro número do texto (ignora moeda, espaços e faixas "x to y")
+_RE_NUMERO = re.compile(r'\d[\d.,]*')
+_RE_CENTAVOS = re.compile(r'\d{1,2}')
+
+
+def locale_do_site(nome_site: Optional[str]) -> str:
+    return LOCALE_POR_SITE.get(nome_site, LOCALE_PADRAO)
+
+
+def _converter(texto: Optional[str], centavos: Optional[str], decimal: str) -> Optional[float]:
+    m = _RE_NUMERO.search(texto) if texto else None
+    if m is None:
+        return None
+    numero = m.group().rstrip('.,')
+    ponto, virgula = numero.rfind('.'), numero.rfind(',')
+    if ponto < 0 and virgula < 0:
+        valor, tem_decimal = float(numero), False
+    else:
+        ultimo = ponto if ponto > virgula else virgula
+        if ponto >= 0 and virgula >= 0:
+            tem_decimal = True  # "1.234,56" / "1,234.56": o último separador é o decimal
+        else:
+            # "12,5" / "12.50" são decimais; "1.234" só é decimal no locale em que "." separa decimais
+            sep = numero[ultimo]
+            tem_decimal = numero.count(sep) == 1 and (len(numero) - ultimo != 4 or sep == decimal)
+        if tem_decimal:
+            valor = float(numero[:ultimo].replace('.', '').replace(',', '') + '.' + numero[ultimo + 1:])
+        else:
+            valor = float(numero.replace('.', '').replace(',', ''))
+    if centavos and not tem_decimal:
+        c = _RE_CENTAVOS.search(centavos)
+        if c:
+            valor += int(c.group().ljust(2, '0')) / 100  # "5" -> 50 centavos
+    return valor
+
+
+def normalizar_preco(texto: Optional[str], centavos: Optional[str] = None,
+                     locale: str = LOCALE_PADRAO) -> Optional[float]:
+    """Texto de preço -> float (None quando não há número)"""
+    return _converter(texto, centavos, LOCALES.get(locale, LOCALES[LOCALE_PADRAO])[1])
+
+
+def normalizar_precos(precos: Sequence[Optional[str]],
+                      centavos: Optional[Sequence[Optional[str]]] = None,
+                      locale: str = LOCALE_PADRAO) -> np.ndarray:
+    """Textos de preço -> array float64 (NaN onde não há preço)"""
+    decimal = LOCALES.get(locale, LOCALES[LOCALE_PADRAO])[1]
+    if centavos is None:
+        centavos = [None] * len(precos)
+    valores = [_converter(p, c, decimal) for p, c in zip(precos, centavos)]
+    return np.array([np.nan if v is None else v for v in valores], dtype=np.float64)
+
+
+def preencher_precos_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Completa a coluna preco_num (jobs antigos / sem preço numérico), site a site"""
+    if 'preco' not in df.columns:
+        return df
+    if 'preco_num' not in df.columns:
+        df['preco_num'] = np.nan
+    faltando = df['preco_num'].isna()
+    if not faltando.any():
+        return df
+    # Coluna nova em vez de escrita in-place: o DataFrame pode ser uma view dos resultados do job
+    preco_num = df['preco_num'].to_numpy(dtype=np.float64, copy=True)
+    sites = df['site'] if 'site' in df.columns else pd.Series(None, index=df.index)
+    for site in sites[faltando].unique():
+        mascara = (faltando & (sites == site)).to_numpy()
+        preco_num[mascara] = normalizar_precos(
+            df['preco'][mascara].tolist(), locale=locale_do_site(site)
+        )
+    df['preco_num'] = preco_num
+    return df
+
+
+def preencher_precos(produtos: List[Dict]) -> List[Dict]:
+    """Igual a ``preencher_precos_df`` para uma lista de dicts (export JSON)"""
+    por_site: Dict[Optional[str], List[Dict]] = {}
+    for p in produtos:
+        if p.get('preco_num') is None and p.get('preco'):
+            por_site.setdefault(p.get('site'), []).append(p)
+    for site, itens in por_site.items():
+        valores = normalizar_precos([p['preco'] for p in itens], locale=locale_do_site(site))
+        for p, v in zip(itens, valores):
+            p['preco_num'] = None if np.isnan(v) else float(v)
+    return produtos
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+🚦 Rate Limiter por Domínio (Token Bucket)
+Limita o ritmo de requisições para cada site somando todos os jobs do processo.
+
+Configuração via ambiente:
+  SCRAPER_RATE="0.5"            -> requisições/segundo padrão por domínio
+  SCRAPER_BURST="3"             -> rajada máxima padrão
+  SCRAPER_RATE_LIMITS="mercadolivre.com.br=0.5:3,amazon.com.br=0.3:2"
+  SCRAPER_RATE_JITTER="0.3"     -> variação aleatória (fração do intervalo) para não parecer robô
+"""
+
+import os
+import random
+import threading
+import time
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+# Segundos níveis comuns em ccTLDs (ex: mercadolivre.com.br)
+_SEGUNDO_NIVEL = {'com', 'net', 'org', 'gov', 'edu', 'co'}
+
+
+def dominio_base(url_ou_host: str) -> str:
+    """Normaliza URL/host para o domínio do site (lista.mercadolivre.com.br -> mercadolivre.com.br)"""
+    host = urlparse(url_ou_host).netloc if '://' in url_ou_host else url_ou_host
+    host = host.split('@')[-1].split(':')[0].lower()
+    partes = host.split('.')
+    if partes[-1].isdigit():
+        return host  # Endereço IP
+    if len(partes) >= 3 and len(partes[-1]) == 2 and partes[-2] in _SEGUNDO_NIVEL:
+        return '.'.join(partes[-3:])
+    return '.'.join(partes[-2:])
+
+
+class TokenBucket:
+    """Balde de tokens com reserva (tokens podem ficar negativos = fila de espera)"""
+
+    def __init__(self, taxa: float, capacidade: float):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.tokens = capacidade
+        self.atualizado = time.monotonic()
+
+    def _repor(self, agora: float):
+        self.tokens = min(self.capacidade, self.tokens + (agora - self.atualizado) * self.taxa)
+        self.atualizado = agora
+
+    def reservar(self) -> float:
+        """Consome um token e retorna quantos segundos esperar até poder usá-lo"""
+        agora = time.monotonic()
+        self._repor(agora)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.taxa
+
+    def tentar(self) -> bool:
+        """Consome um token somente se houver um disponível agora"""
+        self._repor(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class DomainRateLimiter:
+    """Rate limiter global, thread-safe, com um token bucket por domínio"""
+
+    def __init__(self):
+        self.taxa_padrao = float(os.environ.get("SCRAPER_RATE", "0.5"))
+        self.burst_padrao = float(os.environ.get("SCRAPER_BURST", "3"))
+        self.jitter = float(os.environ.get("SCRAPER_RATE_JITTER", "0.3"))
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._limites: Dict[str, tuple] = self._carregar_limites()
+
+    def _carregar_limites(self) -> Dict[str, tuple]:
+        limites = {}
+        raw = os.environ.get("SCRAPER_RATE_LIMITS", "").strip()
+        for part in raw.split(','):
+            if '=' not in part:
+                continue
+            dominio, valor = part.strip().split('=', 1)
+            try:
+                if ':' in valor:
+                    taxa, burst = valor.split(':', 1)
+                    limites[dominio_base(dominio)] = (float(taxa), float(burst))
+                else:
+                    limites[dominio_base(dominio)] = (float(valor), self.burst_padrao)
+            except ValueError:
+                continue
+        return limites
+
+    def configurar(self, dominio: str, taxa: float, burst: Optional[float] = None):
+        """Define taxa (req/s) e rajada de um domínio em tempo de execução"""
+        chave = dominio_base(dominio)
+        burst = burst if burst is not None else self.burst_padrao
+        with self._lock:
+            self._limites[chave] = (taxa, burst)
+            self._buckets[chave] = TokenBucket(taxa, burst)
+
+    def _bucket(self, chave: str) -> TokenBucket:
+        bucket = self._buckets.get(chave)
+        if bucket is None:
+            taxa, burst = self._limites.get(chave, (self.taxa_padrao, self.burst_padrao))
+            bucket = TokenBucket(taxa, burst)
+            self._buckets[chave] = bucket
+        return bucket
+
+    def reservar(self, url_ou_dominio: str) -> float:
+        """Reserva uma vaga e retorna o tempo de espera (já com jitter)"""
+        with self._lock:
+            bucket = self._bucket(dominio_base(url_ou_dominio))
+            if bucket.taxa <= 0:
+                return 0.0  # Sem limite
+            espera = bucket.reservar()
+            intervalo = 1.0 / bucket.taxa
+        if self.jitter > 0:
+            espera += random.uniform(0, self.jitter * intervalo)
+        return espera
+
+    def tentar_adquirir(self, url_ou_dominio: str) -> bool:
+        """Versão não bloqueante: True se pode requisitar agora"""
+        with self._lock:
+            bucket = self._bucket(dominio_base(url_ou_dominio))
+            return bucket.taxa <= 0 or bucket.tentar()
+
+    def aguardar(self, url_ou_dominio: str) -> float:
+        """Bloqueia a thread até o domínio liberar uma requisição"""
+        espera = self.reservar(url_ou_dominio)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    async def aguardar_async(self, url_ou_dominio: str) -> float:
+        """Igual a ``aguardar`` sem bloquear o event loop"""
+        espera = self.reservar(url_ou_dominio)
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+    def estado(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                dominio: {'taxa': b.taxa, 'burst': b.capacidade, 'tokens': round(b.tokens, 2)}
+                for dominio, b in self._buckets.items()
+            }
+
+
+# Instância global
+rate_limiter = DomainRateLimiter()
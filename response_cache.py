@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+💾 Cache de Respostas em Disco
+Guarda páginas de busca já baixadas para que jobs repetidos (mesma URL em
+poucos minutos) não paguem o download nem o risco anti-bot de novo.
+
+- Chave: URL normalizada (host minúsculo, query ordenada, sem fragmento)
+- TTL por site; depois do TTL a página é revalidada com ETag/Last-Modified
+- Limite de tamanho total com despejo LRU
+
+Configuração via ambiente:
+  SCRAPER_CACHE="1"                -> liga/desliga o cache
+  SCRAPER_CACHE_DIR="/tmp/scraping/cache"
+  SCRAPER_CACHE_MAX_MB="200"
+  SCRAPER_CACHE_TTL="300"          -> TTL padrão em segundos
+  SCRAPER_CACHE_TTLS="mercadolivre.com.br=300,amazon.com.br=600"
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from rate_limiter import dominio_base
+
+
+def normalizar_url(url: str) -> str:
+    """Normaliza a URL para uso como chave de cache"""
+    partes = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(partes.query, keep_blank_values=True)))
+    caminho = partes.path or '/'
+    return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), caminho, query, ''))
+
+
+class EntradaCache:
+    """Resposta armazenada (interface parecida com httpx.Response)"""
+
+    def __init__(self, meta: Dict, conteudo: bytes):
+        self.meta = meta
+        self.content = conteudo
+        self.status_code = meta.get('status', 200)
+        self.headers = meta.get('headers', {})
+        self.url = meta.get('url')
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.meta.get('encoding') or 'utf-8', errors='replace')
+
+    @property
+    def idade(self) -> float:
+        return time.time() - self.meta.get('armazenado_em', 0)
+
+    def headers_condicionais(self) -> Dict[str, str]:
+        """Headers para revalidar a entrada no servidor (304 Not Modified)"""
+        headers = {}
+        if self.headers.get('etag'):
+            headers['If-None-Match'] = self.headers['etag']
+        if self.headers.get('last-modified'):
+            headers['If-Modified-Since'] = self.headers['last-modified']
+        return headers
+
+
+class ResponseCache:
+    """Cache de respostas HTTP em disco com TTL por site e despejo LRU"""
+
+    def __init__(self):
+        self.habilitado = os.environ.get("SCRAPER_CACHE", "1") == "1"
+        self.diretorio = os.environ.get("SCRAPER_CACHE_DIR", "/tmp/scraping/cache")
+        self.tamanho_max = int(float(os.environ.get("SCRAPER_CACHE_MAX_MB", "200")) * 1024 * 1024)
+        self.ttl_padrao = float(os.environ.get("SCRAPER_CACHE_TTL", "300"))
+        self.ttls = self._carregar_ttls()
+        self._lock = threading.Lock()
+        self._indice: Optional["OrderedDict[str, int]"] = None  # chave -> bytes (ordem = LRU)
+        self._tamanho_total = 0
+
+    def _carregar_ttls(self) -> Dict[str, float]:
+        ttls = {}
+        for part in os.environ.get("SCRAPER_CACHE_TTLS", "").split(','):
+            if '=' in part:
+                dominio, valor = part.strip().split('=', 1)
+                try:
+                    ttls[dominio_base(dominio)] = float(valor)
+                except ValueError:
+                    continue
+        return ttls
+
+    def ttl(self, url: str) -> float:
+        return self.ttls.get(dominio_base(url), self.ttl_padrao)
+
+    def _chave(self, url: str) -> str:
+        return hashlib.sha256(normalizar_url(url).encode('utf-8')).hexdigest()
+
+    def _caminhos(self, chave: str):
+        base = os.path.join(self.diretorio, chave)
+        return base + '.meta.json', base + '.body'
+
+    def _garantir_indice(self):
+        """Reconstrói o índice LRU a partir do disco (ordem pelo último acesso)"""
+        if self._indice is not None:
+            return
+        self._indice = OrderedDict()
+        self._tamanho_total = 0
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            entradas = []
+            for nome in os.listdir(self.diretorio):
+                if nome.endswith('.body'):
+                    caminho = os.path.join(self.diretorio, nome)
+                    st = os.stat(caminho)
+                    entradas.append((st.st_mtime, nome[:-5], st.st_size))
+            for _, chave, tamanho in sorted(entradas):
+                self._indice[chave] = tamanho
+                self._tamanho_total += tamanho
+        except OSError:
+            pass
+
+    def obter(self, url: str) -> Optional[EntradaCache]:
+        """Retorna a entrada armazenada (fresca ou não) ou None"""
+        if not self.habilitado:
+            return None
+        chave = self._chave(url)
+        meta_path, body_path = self._caminhos(chave)
+        with self._lock:
+            self._garantir_indice()
+            if chave not in self._indice:
+                return None
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(body_path, 'rb') as f:
+                    conteudo = f.read()
+                os.utime(body_path, None)  # Marca acesso para o LRU após reinício
+            except (OSError, ValueError):
+                self._remover(chave)
+                return None
+            self._indice.move_to_end(chave)
+        return EntradaCache(meta, conteudo)
+
+    def fresca(self, entrada: EntradaCache) -> bool:
+        return entrada.idade < self.ttl(entrada.url or '')
+
+    def salvar(self, url: str, resp) -> None:
+        """Armazena uma resposta 200 (httpx.Response ou compatível)"""
+        if not self.habilitado:
+            return
+        headers = {k.lower(): v for k, v in resp.headers.items()
+                   if k.lower() in ('etag', 'last-modified', 'content-type')}
+        meta = {
+            'url': normalizar_url(url),
+            'status': resp.status_code,
+            'headers': headers,
+            'encoding': getattr(resp, 'encoding', None),
+            'armazenado_em': time.time(),
+        }
+        self._gravar(self._chave(url), meta, resp.content)
+
+    def renovar(self, url: str, entrada: EntradaCache, resp=None) -> None:
+        """Após um 304, reinicia o TTL da entrada (e atualiza validadores)"""
+        meta = dict(entrada.meta)
+        meta['armazenado_em'] = time.time()
+        if resp is not None:
+            for k in ('etag', 'last-modified'):
+                if resp.headers.get(k):
+                    meta['headers'][k] = resp.headers[k]
+        chave = self._chave(url)
+        meta_path, _ = self._caminhos(chave)
+        with self._lock:
+            try:
+                self._escrever_atomico(meta_path, json.dumps(meta).encode('utf-8'))
+            except OSError:
+                pass
+
+    def _escrever_atomico(self, caminho: str, dados: bytes):
+        tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(dados)
+        os.replace(tmp, caminho)
+
+    def _gravar(self, chave: str, meta: Dict, conteudo: bytes):
+        meta_path, body_path = self._caminhos(chave)
+        with self._lock:
+            self._garantir_indice()
+            try:
+                os.makedirs(self.diretorio, exist_ok=True)
+                self._escrever_atomico(body_path, conteudo)
+                self._escrever_atomico(meta_path, json.dumps(meta).encode('utf-8'))
+            except OSError:
+                return
+            self._tamanho_total += len(conteudo) - self._indice.pop(chave, 0)
+            self._indice[chave] = len(conteudo)
+            self._despejar()
+
+    def _remover(self, chave: str):
+        self._tamanho_total -= self._indice.pop(chave, 0)
+        for caminho in self._caminhos(chave):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    def _despejar(self):
+        """Remove as entradas menos usadas até caber no limite"""
+        while self._tamanho_total > self.tamanho_max and len(self._indice) > 1:
+            chave = next(iter(self._indice))
+            self._remover(chave)
+
+    def limpar(self):
+        with self._lock:
+            self._garantir_indice()
+            for chave in list(self._indice):
+                self._remover(chave)
+
+    def estado(self) -> Dict:
+        with self._lock:
+            self._garantir_indice()
+            return {
+                'habilitado': self.habilitado,
+                'entradas': len(self._indice),
+                'bytes': self._tamanho_total,
+                'limite_bytes': self.tamanho_max,
+            }
+
+
+# Instância global
+response_cache = ResponseCache()
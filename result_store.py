@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+🗃️ Resultados em Colunas
+Guarda os produtos de um job coluna a coluna em vez de um objeto Produto por
+item. ``site`` é codificado em dicionário (um código int16 por produto),
+``preco_num`` fica num array de float64 e os textos de baixa cardinalidade
+(preço, avaliação, reviews) são internados.
+
+Objetos/dicts de produto só são montados nas bordas da API (``dicts``); export
+e análise usam ``to_dataframe`` / ``to_arrow``, sem cópia depois de ``congelar``.
+"""
+
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Ordem das colunas = ordem dos campos do modelo Produto
+COLUNAS = ('nome', 'preco', 'preco_num', 'link', 'site', 'avaliacao', 'reviews')
+
+
+def _intern(valor: Optional[str]) -> Optional[str]:
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+class ResultadosColunares:
+    """Produtos de um job em colunas (append por página, leitura de qualquer thread)"""
+
+    def __init__(self):
+        self.nome: List[Optional[str]] = []
+        self.preco: List[Optional[str]] = []
+        self.link: List[Optional[str]] = []
+        self.avaliacao: List[Optional[str]] = []
+        self.reviews: List[Optional[str]] = []
+        self.preco_num = array('d')
+        self.site_codigos = array('h')
+        self.sites: List[str] = []
+        self._codigo_site: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Linhas completas: leitores nunca enxergam uma linha pela metade
+        self._n = 0
+        self.congelado = False
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _codigo(self, site: str) -> int:
+        codigo = self._codigo_site.get(site)
+        if codigo is None:
+            codigo = self._codigo_site[site] = len(self.sites)
+            self.sites.append(site)
+        return codigo
+
+    def adicionar(self, linhas: Sequence[Tuple], precos_num: Iterable[float], site: str):
+        """Acrescenta uma página: linhas (nome, preco, link, avaliacao, reviews, ...) + preços numéricos"""
+        if self.congelado:
+            raise RuntimeError("Resultados já congelados")
+        with self._lock:
+            codigo = self._codigo(site)
+            for (nome, preco, link, avaliacao, reviews, *_), preco_num in zip(linhas, precos_num):
+                self.nome.append(nome)  # nome/link são quase sempre únicos: internar não compensa
+                self.preco.append(_intern(preco))
+                self.link.append(link)
+                self.avaliacao.append(_intern(avaliacao))
+                self.reviews.append(_intern(reviews))
+                self.preco_num.append(np.nan if preco_num is None else preco_num)
+                self.site_codigos.append(codigo)
+            self._n = len(self.nome)
+
+    def congelar(self):
+        """Fim do job: troca os arrays por ndarrays para exportar sem cópia"""
+        with self._lock:
+            if self.congelado:
+                return
+            self.preco_num = np.frombuffer(self.preco_num, dtype=np.float64).copy()
+            self.site_codigos = np.frombuffer(self.site_codigos, dtype=np.int16).copy()
+            self.congelado = True
+
+    @classmethod
+    def de_dicts(cls, produtos: List[Dict]) -> "ResultadosColunares":
+        """Monta a partir de dicts de Produto (arquivo persistido)"""
+        resultados = cls()
+        # Mantém a ordem original: agrupa só sequências contíguas do mesmo site
+        inicio = 0
+        for i in range(1, len(produtos) + 1):
+            if i == len(produtos) or produtos[i].get('site') != produtos[inicio].get('site'):
+                bloco = produtos[inicio:i]
+                resultados.adicionar(
+                    [(p.get('nome'), p.get('preco'), p.get('link'), p.get('avaliacao'), p.get('reviews'))
+                     for p in bloco],
+                    [p.get('preco_num') for p in bloco],
+                    bloco[0].get('site')
+                )
+                inicio = i
+        resultados.congelar()
+        return resultados
+
+    # ---------- Leitura ----------
+
+    def colunas(self, inicio: int, fim: int):
+        """Fatias [inicio:fim] das colunas, na ordem de COLUNAS (site já decodificado)"""
+        preco_num = self.preco_num[inicio:fim]
+        codigos = self.site_codigos[inicio:fim]
+        return (
+            self.nome[inicio:fim], self.preco[inicio:fim], preco_num, self.link[inicio:fim],
+            [self.sites[c] for c in codigos], self.avaliacao[inicio:fim], self.reviews[inicio:fim]
+        )
+
+    def dicts(self, inicio: int = 0, fim: Optional[int] = None) -> List[Dict]:
+        """Materializa os produtos [inicio:fim] como dicts no formato de Produto"""
+        n = self._n
+        fim = n if fim is None else min(fim, n)
+        inicio = max(0, min(inicio, fim))
+        colunas = self.colunas(inicio, fim)
+        return [
+            {
+                'nome': nome, 'preco': preco,
+                'preco_num': None if preco_num != preco_num else float(preco_num),  # NaN -> None
+                'link': link, 'site': site, 'avaliacao': avaliacao, 'reviews': reviews
+            }
+            for nome, preco, preco_num, link, site, avaliacao, reviews in zip(*colunas)
+        ]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame com ``site`` categórico; sem cópia dos arrays numéricos se congelado"""
+        n = self._n
+        if self.congelado:
+            preco_num = self.preco_num
+            codigos = self.site_codigos
+        else:
+            preco_num = np.array(self.preco_num[:n], dtype=np.float64)
+            codigos = np.array(self.site_codigos[:n], dtype=np.int16)
+        dados = {
+            'nome': self.nome[:n],
+            'preco': self.preco[:n],
+            'preco_num': preco_num[:n],
+            'link': self.link[:n],
+            'site': pd.Categorical.from_codes(codigos[:n], categories=self.sites)
+            if self.sites else pd.Categorical([]),
+            'avaliacao': self.avaliacao[:n],
+            'reviews': self.reviews[:n],
+        }
+        return pd.DataFrame(dados, columns=list(COLUNAS), copy=False)
+
+    def to_arrow(self):
+        """Tabela Arrow com ``site`` como DictionaryArray (requer pyarrow)"""
+        import pyarrow as pa
+        n = self._n
+        preco_num = np.asarray(self.preco_num[:n], dtype=np.float64)
+        codigos = np.asarray(self.site_codigos[:n], dtype=np.int16)
+        return pa.table({
+            'nome': pa.array(self.nome[:n], type=pa.string()),
+            'preco': pa.array(self.preco[:n], type=pa.string()),
+            'preco_num': pa.array(preco_num, from_pandas=True),
+            'link': pa.array(self.link[:n], type=pa.string()),
+            'site': pa.DictionaryArray.from_arrays(pa.array(codigos), pa.array(self.sites, type=pa.string())),
+            'avaliacao': pa.array(self.avaliacao[:n], type=pa.string()),
+            'reviews': pa.array(self.reviews[:n], type=pa.string()),
+        })
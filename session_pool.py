@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+♨️ Pool de Sessões Aquecidas
+Mantém sessões já aquecidas (cookies + conexões keep-alive) por site para que
+os jobs não paguem o warm-up da página inicial a cada execução.
+
+Configuração via ambiente:
+  SCRAPER_SESSION_POOL_SIZE="2"    -> sessões ociosas mantidas por site
+  SCRAPER_SESSION_TTL="900"        -> segundos de vida de uma sessão
+  SCRAPER_SESSION_MAX_USES="20"    -> jobs atendidos por uma sessão antes de reciclar
+  SCRAPER_SESSION_PREWARM="mercado_livre,amazon" -> sites aquecidos na subida da API
+  SCRAPER_SESSION_EAGER_REFILL="0" -> 1 = cada checkout já aquece sessões em background até
+                                      completar o pool (mais visitas à página inicial)
+
+Sem o reabastecimento antecipado o pool cresce com as próprias sessões
+devolvidas no checkin; só a sessão descartada no checkin (bloqueada,
+expirada ou usada demais) é reposta em background.
+"""
+
+import os
+import asyncio
+import contextvars
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from fetch_engine import SessaoAsync
+
+
+class SessaoPool:
+    """Pool de ``SessaoAsync`` por site.
+
+    Usado somente dentro do event loop do fetch_engine, então não precisa de
+    locks: cada sessão pertence a um único job entre checkout e checkin.
+    """
+
+    def __init__(self):
+        self.tamanho = max(0, int(os.environ.get("SCRAPER_SESSION_POOL_SIZE", "2")))
+        self.ttl = float(os.environ.get("SCRAPER_SESSION_TTL", "900"))
+        self.max_usos = max(1, int(os.environ.get("SCRAPER_SESSION_MAX_USES", "20")))
+        self.reabastecer_no_checkout = os.environ.get("SCRAPER_SESSION_EAGER_REFILL", "0") == "1"
+        self._fabrica: Optional[Callable[[dict], Awaitable[SessaoAsync]]] = None
+        self._ociosas: Dict[str, Deque[SessaoAsync]] = {}
+        self._aquecendo: Dict[str, int] = {}
+        self._tarefas = set()
+        self.estatisticas = {'reutilizadas': 0, 'criadas': 0, 'recicladas': 0}
+
+    def configurar(self, fabrica: Callable[[dict], Awaitable[SessaoAsync]]):
+        """Define a corrotina que cria e aquece uma sessão nova para um site"""
+        self._fabrica = fabrica
+
+    def _valida(self, sessao: SessaoAsync) -> bool:
+        if sessao.bloqueada:
+            return False
+        if time.time() - sessao.criada_em > self.ttl:
+            return False
+        return sessao.usos < self.max_usos
+
+    async def _criar(self, site_config: dict) -> SessaoAsync:
+        self.estatisticas['criadas'] += 1
+        return await self._fabrica(site_config)
+
+    async def checkout(self, site_config: dict) -> SessaoAsync:
+        """Retira uma sessão aquecida do pool (ou aquece uma na hora se não houver)"""
+        chave = site_config['nome']
+        fila = self._ociosas.setdefault(chave, deque())
+        sessao = None
+        while fila:
+            candidata = fila.popleft()
+            if self._valida(candidata):
+                sessao = candidata
+                self.estatisticas['reutilizadas'] += 1
+                break
+            self.estatisticas['recicladas'] += 1
+            await candidata.aclose()
+        if sessao is None:
+            sessao = await self._criar(site_config)
+        sessao.usos += 1
+        if self.reabastecer_no_checkout:
+            self._reabastecer(site_config)
+        return sessao
+
+    async def checkin(self, sessao: SessaoAsync, site_config: dict):
+        """Devolve a sessão ao pool; sessões bloqueadas/expiradas são descartadas"""
+        fila = self._ociosas.setdefault(site_config['nome'], deque())
+        if self._valida(sessao) and len(fila) < self.tamanho:
+            fila.append(sessao)
+            return
+        self.estatisticas['recicladas'] += 1
+        await sessao.aclose()
+        self._reabastecer(site_config)
+
+    def _reabastecer(self, site_config: dict):
+        """Aquece sessões em background até o pool voltar ao tamanho configurado"""
+        chave = site_config['nome']
+        faltam = self.tamanho - len(self._ociosas.get(chave, ())) - self._aquecendo.get(chave, 0)
+        for _ in range(max(0, faltam)):
+            self._aquecendo[chave] = self._aquecendo.get(chave, 0) + 1
+            # Contexto vazio: o aquecimento em background não entra nos tempos do job que o disparou
+            tarefa = asyncio.get_running_loop().create_task(self._aquecer_uma(site_config),
+                                                            context=contextvars.Context())
+            self._tarefas.add(tarefa)
+            tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _aquecer_uma(self, site_config: dict):
+        chave = site_config['nome']
+        try:
+            sessao = await self._criar(site_config)
+            fila = self._ociosas.setdefault(chave, deque())
+            if len(fila) < self.tamanho:
+                fila.append(sessao)
+            else:
+                await sessao.aclose()
+        except Exception as e:
+            print(f"Aviso: falha ao aquecer sessão para {chave}: {e}")
+        finally:
+            self._aquecendo[chave] -= 1
+
+    async def aquecer(self, site_config: dict):
+        """Pré-aquece o pool de um site (ex: na subida da API)"""
+        self._reabastecer(site_config)
+
+    async def fechar_todas(self):
+        for tarefa in list(self._tarefas):
+            tarefa.cancel()
+        for fila in self._ociosas.values():
+            while fila:
+                await fila.popleft().aclose()
+
+    def estado(self) -> Dict:
+        return {
+            'ociosas': {site: len(fila) for site, fila in self._ociosas.items()},
+            'aquecendo': dict(self._aquecendo),
+            **self.estatisticas
+        }
+
+
+# Instância global
+session_pool = SessaoPool()
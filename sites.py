@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+🌐 Sites Suportados
+Configuração dos sites de e-commerce (URL de busca, seletores e paginação),
+sem dependências da API: usada também pelos benchmarks offline.
+
+Configuração via ambiente:
+  SCRAPER_SITES_BASE_URL=""  -> aponta todos os sites para outro servidor (ex: a loja local dos
+                                benchmarks): <base>/<site>/<caminho original>
+"""
+
+import os
+from urllib.parse import urlsplit
+
+# Dicionário de sites suportados
+# Chave opcional "parser" por site: selectolax | lxml | bs4 (padrão: SCRAPER_PARSER)
+SITES_SUPORTADOS = {
+    "mercado_livre": {
+        "nome": "Mercado Livre",
+        "base_url": "https://lista.mercadolivre.com.br",
+        "home_url": "https://www.mercadolivre.com.br",
+        "seletores": {
+            "item": "li.ui-search-layout__item",
+            "nome": ".poly-component__title",
+            "preco": ".andes-money-amount__fraction",
+            "centavos": ".andes-money-amount__cents",
+            "link": ".poly-component__title",
+            "avaliacao": "[class*='rating']",
+            "reviews": ".poly-reviews__total"
+    },  # adicionaremos fallback dinâmico no código
+        "paginacao": "_Desde_{}"
+    },
+    "amazon": {
+        "nome": "Amazon",
+        "base_url": "https://www.amazon.com.br/s?k=",
+        "home_url": "https://www.amazon.com.br",
+        "seletores": {
+            "item": "[data-component-type='s-search-result']",
+            "nome": "h2 a span",
+            "preco": ".a-price-whole",
+            "centavos": ".a-price-fraction",
+            "link": "h2 a",
+            "avaliacao": ".a-icon-alt",
+            "reviews": ".a-size-base"
+        },
+        "paginacao": "&page={}"
+    },
+    "ebay": {
+        "nome": "eBay",
+        "base_url": "https://www.ebay.com/sch/i.html?_nkw=",
+        "home_url": "https://www.ebay.com.br",
+        "seletores": {
+            "item": "li.s-item",
+            "nome": ".s-item__title",
+            "preco": ".s-item__price",
+            "link": ".s-item__link",
+            "avaliacao": ".x-star-rating span.clipped",
+            "reviews": ".s-item__reviews-count"
+        },
+        "paginacao": "&_pgn={}"
+    }
+}
+
+
+def redirecionar_sites(base: str):
+    """Troca o host de todos os sites por ``base``, mantendo caminho e query de cada um"""
+    base = base.rstrip('/')
+    for chave, config in SITES_SUPORTADOS.items():
+        original = urlsplit(config['base_url'])
+        config['base_url'] = f"{base}/{chave}{original.path}" + (f"?{original.query}" if original.query else '')
+        config['home_url'] = f"{base}/{chave}"
+
+
+if os.environ.get("SCRAPER_SITES_BASE_URL"):
+    redirecionar_sites(os.environ["SCRAPER_SITES_BASE_URL"])
@@ -4,6 +4,10 @@ const API_BASE_URL = window.location.origin;
 // Estado da aplicação
 let currentJobId = null;
 let statusCheckInterval = null;
+let eventSource = null;
+// Produtos já recebidos e cursor para pedir só os novos (?since=)
+let produtosRecebidos = [];
+let produtosCursor = 0;
 
 // Elementos DOM
 const elements = {
@@ -133,12 +137,67 @@ function showStatus(jobId) {
 
 // Monitoramento de status
 function startStatusMonitoring() {
+    stopStatusMonitoring();
+    produtosRecebidos = [];
+    produtosCursor = 0;
+    
+    // Eventos enviados pelo servidor (SSE); polling só como fallback
+    if (window.EventSource) {
+        startEventStream();
+    } else {
+        startPolling();
+    }
+}
+
+function startPolling() {
+    if (statusCheckInterval) return;
+    statusCheckInterval = setInterval(checkJobStatus, 2000);
+    checkJobStatus(); // Primeira verificação imediata
+}
+
+function stopStatusMonitoring() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
     if (statusCheckInterval) {
         clearInterval(statusCheckInterval);
+        statusCheckInterval = null;
     }
+}
+
+// Acompanhar o job pelo stream de eventos (/job/{id}/events)
+function startEventStream() {
+    let ultimoStatus = 'pending';
+    const dadosDo = (e) => JSON.parse(e.data).dados || {};
     
-    statusCheckInterval = setInterval(checkJobStatus, 2000);
-    checkJobStatus(); // Primeira verificação imediata
+    eventSource = new EventSource(`${API_BASE_URL}/job/${currentJobId}/events`);
+    eventSource.addEventListener('status', (e) => {
+        ultimoStatus = dadosDo(e).status;
+        updateStatusDisplay({ status: ultimoStatus });
+    });
+    eventSource.addEventListener('progresso', (e) => {
+        updateStatusDisplay({ status: ultimoStatus, message: dadosDo(e).mensagem });
+    });
+    eventSource.addEventListener('bloqueio', (e) => {
+        const { pagina, motivo } = dadosDo(e);
+        updateStatusDisplay({ status: ultimoStatus, message: `Bloqueio na página ${pagina}: ${motivo}` });
+    });
+    // Página concluída: busca só os produtos novos
+    eventSource.addEventListener('pagina', () => checkJobStatus());
+    eventSource.addEventListener('fim', () => {
+        eventSource.close();
+        eventSource = null;
+        checkJobStatus();
+    });
+    eventSource.onerror = () => {
+        // Stream indisponível ou conexão perdida: volta ao polling
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+            startPolling();
+        }
+    };
 }
 
 // Verificar status do job
@@ -146,29 +205,35 @@ async function checkJobStatus() {
     if (!currentJobId) return;
     
     try {
-        const response = await fetch(`${API_BASE_URL}/job/${currentJobId}`);
+        const response = await fetch(`${API_BASE_URL}/job/${currentJobId}?since=${produtosCursor}`);
         const data = await response.json();
         
+        // Cada consulta traz só os produtos coletados desde a anterior
+        // (consultas concorrentes com o mesmo cursor não duplicam produtos)
+        if (data.produtos && data.offset === produtosCursor) {
+            produtosRecebidos.push(...data.produtos);
+            produtosCursor = data.cursor;
+        }
+        data.produtos = produtosRecebidos;
+        
         updateStatusDisplay(data);
         
-        // Se completou ou erro, parar monitoramento
-        if (data.status === 'completed' || data.status === 'error') {
-            clearInterval(statusCheckInterval);
-            statusCheckInterval = null;
+        // Se completou, falhou ou foi cancelado, parar monitoramento
+        if (['completed', 'failed', 'cancelled', 'error'].includes(data.status)) {
+            stopStatusMonitoring();
             
             if (data.status === 'completed') {
                 showResults(data);
             } else {
-                showError(data);
+                showError({ message: data.erro || data.progress });
             }
         }
         
     } catch (error) {
         console.error('Erro ao verificar status:', error);
         // Se há muitos erros consecutivos, parar o monitoramento
-        if (statusCheckInterval) {
-            clearInterval(statusCheckInterval);
-            statusCheckInterval = null;
+        if (statusCheckInterval || eventSource) {
+            stopStatusMonitoring();
             showError({ message: 'Erro de conexão com a API' });
         }
     }
@@ -311,10 +376,7 @@ async function handleDownload() {
 function handleNewSearch() {
     // Reset estado
     currentJobId = null;
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
-        statusCheckInterval = null;
-    }
+    stopStatusMonitoring();
     
     // Esconder containers
     elements.statusContainer.style.display = 'none';
@@ -356,7 +418,5 @@ window.addEventListener('unhandledrejection', (event) => {
 
 // Limpeza na saída
 window.addEventListener('beforeunload', () => {
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
-    }
+    stopStatusMonitoring();
 });
@@ -17,6 +17,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+from rate_limiter import rate_limiter
+
 
 class StealthScraper:
     """Scraper com técnicas avançadas anti-detecção"""
@@ -216,15 +218,11 @@ class StealthScraper:
             
     def is_rate_limited(self, domain: str) -> bool:
         """Verifica se devemos aplicar rate limiting"""
-        now = time.time()
-        last_request = self.last_request_time.get(domain, 0)
-        
-        # Mínimo 3 segundos entre requests para mesmo domínio
-        if now - last_request < 3:
-            return True
-            
-        self.last_request_time[domain] = now
-        return False
+        # Usa o token bucket global (compartilhado por todos os jobs do processo)
+        allowed = rate_limiter.tentar_adquirir(domain)
+        if allowed:
+            self.last_request_time[domain] = time.time()
+        return not allowed
 
 
 # Instância global para reutilização
@@ -0,0 +1,76 @@
+"""
+Fixtures dos testes: a API roda contra a loja local (benchmarks/servidor_loja.py)
+numa thread, sem proxies, limite de taxa, cache nem esperas humanas. O ambiente
+é montado antes de importar ``api`` (sites e configurações são lidos na importação).
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import uvicorn  # noqa: E402
+
+from benchmarks.servidor_loja import Loja, criar_app  # noqa: E402
+
+
+def _subir_loja(loja: Loja) -> str:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        porta = s.getsockname()[1]
+    servidor = uvicorn.Server(uvicorn.Config(criar_app(loja), host='127.0.0.1', port=porta, log_level='warning'))
+    threading.Thread(target=servidor.run, daemon=True).start()
+    limite = time.monotonic() + 10
+    while not servidor.started:
+        if time.monotonic() > limite:
+            raise RuntimeError("Loja local não subiu a tempo")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{porta}"
+
+
+LOJA = Loja({'latencia_ms': 0.0, 'jitter_ms': 0.0, 'paginas': 3})
+os.environ.update({
+    'SCRAPER_SITES_BASE_URL': _subir_loja(LOJA),
+    'SCRAPER_JOBS_FILE': os.path.join(tempfile.mkdtemp(prefix='scraper_testes_'), 'jobs.json'),
+    'SCRAPER_PROXIES': 'off',
+    'SCRAPER_RATE': '0',
+    'SCRAPER_CACHE': '0',
+    'SCRAPER_HUMAN_DELAY_FACTOR': '0',
+    'SCRAPER_SESSION_PREWARM': '',
+    'SCRAPER_TRACE_FILE': '',
+})
+
+
+@pytest.fixture
+def loja():
+    """Loja local; a configuração alterada no teste volta ao padrão no fim"""
+    config = dict(LOJA.config)
+    yield LOJA
+    LOJA.configurar(**config)
+
+
+@pytest.fixture(scope='session')
+def cliente():
+    from fastapi.testclient import TestClient
+    import api
+    with TestClient(api.app) as c:
+        yield c
+
+
+def esperar_status(cliente, job_id: str, status=('completed', 'failed', 'cancelled'), timeout: float = 30.0) -> dict:
+    """Consulta o job até ele chegar a um dos ``status`` (falha no timeout)"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        dados = cliente.get(f'/job/{job_id}').json()
+        if dados['status'] in status:
+            return dados
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} não chegou a {status} (último: {dados['status']})")
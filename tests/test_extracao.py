@@ -0,0 +1,52 @@
+"""Extração de campos com os seletores de sites.py"""
+
+import gzip
+import os
+
+import pytest
+
+from benchmarks import paginas_sinteticas
+from page_parser import CAMPOS, extrair_pagina
+from sites import SITES_SUPORTADOS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+def _fixture(nome: str) -> bytes:
+    with open(os.path.join(FIXTURES, nome), 'rb') as f:
+        return gzip.decompress(f.read())
+
+
+def _produtos(conteudo: bytes, site: str):
+    # Como no job: o nome de exibição do site escolhe fallbacks e o domínio dos links
+    config = SITES_SUPORTADOS[site]
+    return [dict(zip(CAMPOS, valores)) for valores in extrair_pagina(conteudo, config['seletores'], config['nome']).produtos]
+
+
+@pytest.mark.parametrize('conteudo', [
+    paginas_sinteticas.pagina_mercado_livre('notebook', 1),
+    _fixture('mercado_livre_p1.html.gz'),
+    _fixture('mercado_livre_layout_alternativo.html.gz'),  # só div.poly-card: seletores de fallback
+], ids=['sintetica', 'fixture', 'layout_alternativo'])
+def test_mercado_livre_reviews_e_a_contagem_de_avaliacoes(conteudo):
+    produtos = _produtos(conteudo, 'mercado_livre')
+    assert produtos
+    for produto in produtos:
+        # "(1234)" de .poly-reviews__total, não a nota de .poly-reviews__rating
+        assert produto['reviews'].startswith('(') and produto['reviews'].strip('()').isdigit()
+        assert produto['reviews'] != produto['avaliacao']
+        assert produto['link'].startswith('https://www.mercadolivre.com.br/')
+
+
+def test_modo_por_regiao_so_no_bs4(monkeypatch):
+    import page_parser
+    from parser_backends import iterar_regioes
+    conteudo = paginas_sinteticas.pagina_mercado_livre('notebook', 1)
+    seletores = SITES_SUPORTADOS['mercado_livre']['seletores']
+    assert iterar_regioes(conteudo, seletores['item'], 'lxml') is None
+    assert iterar_regioes(conteudo, seletores['item'], 'selectolax') is None
+    assert iterar_regioes(conteudo, seletores['item'], 'bs4') is not None
+
+    por_regiao = extrair_pagina(conteudo, seletores, 'Mercado Livre', 'bs4').produtos
+    monkeypatch.setattr(page_parser, 'PARSE_POR_REGIAO', False)
+    assert extrair_pagina(conteudo, seletores, 'Mercado Livre', 'bs4').produtos == por_regiao
@@ -0,0 +1,37 @@
+"""Limite de concorrência por domínio do fetch engine"""
+
+import asyncio
+
+from fetch_engine import AsyncFetchEngine
+
+
+class _SessaoLenta:
+    """Sessão falsa: registra quantas requisições estão em voo ao mesmo tempo"""
+
+    def __init__(self):
+        self.em_voo = 0
+        self.maximo = 0
+
+    async def get(self, url, **kwargs):
+        self.em_voo += 1
+        self.maximo = max(self.maximo, self.em_voo)
+        await asyncio.sleep(0.05)
+        self.em_voo -= 1
+
+
+def test_subdominios_dividem_o_limite_do_dominio(monkeypatch):
+    monkeypatch.setenv('SCRAPER_DOMAIN_CONCURRENCY', '1')
+    engine = AsyncFetchEngine()
+    sessao = _SessaoLenta()
+
+    async def _buscar():
+        await asyncio.gather(
+            engine.get(sessao, 'https://lista.mercadolivre.com.br/notebook'),
+            engine.get(sessao, 'https://www.mercadolivre.com.br/'),
+        )
+
+    try:
+        engine.run(_buscar(), timeout=10)
+    finally:
+        engine.encerrar()
+    assert sessao.maximo == 1
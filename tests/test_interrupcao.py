@@ -0,0 +1,33 @@
+"""Jobs interrompidos pelo encerramento da API não ficam 'running' no journal"""
+
+from conftest import esperar_status
+
+
+def test_worker_parado_no_shutdown_marca_o_job(cliente, loja):
+    import api
+    loja.configurar(latencia_ms=300.0)
+    pedido = {'site': 'ebay', 'termo_busca': 'interrompido no shutdown', 'max_paginas': 3, 'delay': 0}
+    job_id = cliente.post('/scraping', json=pedido).json()['job_id']
+    esperar_status(cliente, job_id, status=('running',))
+
+    # O que o shutdown da API faz com os workers
+    api.fetch_engine.run(api.job_scheduler.encerrar(), timeout=10)
+
+    dados = cliente.get(f'/job/{job_id}').json()
+    assert dados['status'] == 'failed'
+    assert dados['erro'] == api.ERRO_INTERROMPIDO
+    assert api.job_journal.resumo(job_id)['status'] == 'failed'
+
+
+def test_jobs_rodando_de_execucao_anterior_sao_reconciliados(cliente):
+    import api
+    orfao = {'job_id': 'orfao-running', 'status': 'running', 'progress': '...', 'total_produtos': 0,
+             'erro': None, 'created_at': '2026-01-01T00:00:00', 'completed_at': None,
+             'config': {'site': 'ebay', 'termo_busca': 'x', 'max_paginas': 1, 'delay': 0}}
+    api.job_journal.salvar(orfao['job_id'], orfao)  # como ficou no disco após um crash
+
+    api._reconciliar_interrompidos()
+
+    assert api.job_journal.resumo('orfao-running')['status'] == 'failed'
+    dados = cliente.get('/job/orfao-running').json()
+    assert dados['status'] == 'failed' and dados['erro'] == api.ERRO_INTERROMPIDO
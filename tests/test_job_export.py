@@ -0,0 +1,29 @@
+"""Exportação dos resultados: formatos e dependências opcionais"""
+
+import sys
+
+from conftest import esperar_status
+
+
+def test_parquet_sem_pyarrow_responde_501(cliente, monkeypatch):
+    pedido = {'site': 'ebay', 'termo_busca': 'parquet sem pyarrow', 'max_paginas': 1, 'delay': 0}
+    job_id = cliente.post('/scraping', json=pedido).json()['job_id']
+    assert esperar_status(cliente, job_id)['status'] == 'completed'
+
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)  # import pyarrow -> ImportError
+    resp = cliente.get(f'/job/{job_id}/download', params={'format': 'parquet'})
+    assert resp.status_code == 501
+    assert 'pyarrow' in resp.json()['detail']
+
+    assert cliente.get(f'/job/{job_id}/download', params={'format': 'xls'}).status_code == 400
+
+
+def test_parquet(cliente):
+    import pyarrow.parquet as pq
+    import api
+    pedido = {'site': 'mercado_livre', 'termo_busca': 'parquet', 'max_paginas': 1, 'delay': 0}
+    job_id = cliente.post('/scraping', json=pedido).json()['job_id']
+    assert esperar_status(cliente, job_id)['status'] == 'completed'
+    assert cliente.get(f'/job/{job_id}/download', params={'format': 'parquet'}).status_code == 200
+    tabela = pq.read_table(api.exportador_jobs.caminho(job_id, 'parquet'))
+    assert tabela.num_rows == 50 and tabela.column('preco_num').null_count == 0
@@ -0,0 +1,56 @@
+"""Journal de jobs: seguidores single-flight gravados por referência ao líder"""
+
+import os
+
+import pytest
+
+from job_journal import JobJournal
+
+PRODUTOS = [{'nome': f'Produto {i}', 'preco': 'R$ 10,00', 'link': f'https://loja/{i}'} for i in range(50)]
+
+
+def _job(job_id: str, **campos) -> dict:
+    return {'job_id': job_id, 'status': 'completed', 'total_produtos': len(PRODUTOS), 'produtos': PRODUTOS, **campos}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    j = JobJournal(str(tmp_path / 'jobs.json'))
+    j.carregar()
+    yield j
+    j.fechar()
+
+
+def _bytes_journal(journal) -> int:
+    return os.path.getsize(journal.journal_path)
+
+
+def test_seguidor_grava_so_a_referencia(journal):
+    journal.salvar('L', _job('L', seguidores=['F']), lambda: PRODUTOS)
+    antes = _bytes_journal(journal)
+    journal.salvar('F', _job('F', lider='L'), lambda: PRODUTOS, produtos_de='L')
+    assert _bytes_journal(journal) - antes < 300  # metadados + referência, sem a lista
+    assert journal.persistido('F')
+    assert journal.ler('F')['produtos'] == PRODUTOS
+
+
+def test_referencia_sobrevive_a_compactacao_e_recarga(journal, tmp_path):
+    journal.salvar('L', _job('L', seguidores=['F']), lambda: PRODUTOS)
+    journal.salvar('F', _job('F', lider='L'), lambda: PRODUTOS, produtos_de='L')
+    assert journal.compactar()
+    assert journal.ler('F')['produtos'] == PRODUTOS
+    assert 'produtos_de' not in journal.ler('F')
+
+    outro = JobJournal(str(tmp_path / 'jobs.json'))
+    outro.carregar()
+    assert outro.ler('F')['produtos'] == PRODUTOS
+
+
+def test_materializar_antes_de_remover_o_lider(journal):
+    journal.salvar('L', _job('L', seguidores=['F']), lambda: PRODUTOS)
+    journal.salvar('F', _job('F', lider='L'), lambda: PRODUTOS, produtos_de='L')
+    journal.materializar('F', journal.ler('F')['produtos'])
+    journal.remover('L')
+    assert journal.ler('F')['produtos'] == PRODUTOS
+    assert journal.compactar()
+    assert journal.ler('F')['produtos'] == PRODUTOS
@@ -0,0 +1,54 @@
+"""Normalização de preços: locale, centavos e pareamento dos centavos com o preço"""
+
+import math
+
+import pytest
+
+from page_parser import extrair_pagina
+from parser_backends import BACKENDS, disponivel
+from price_normalizer import normalizar_preco, normalizar_precos
+from sites import SITES_SUPORTADOS
+
+
+@pytest.mark.parametrize('texto, centavos, locale, esperado', [
+    ('1.234', None, 'pt_BR', 1234.0),
+    ('1.234,56', None, 'pt_BR', 1234.56),
+    ('1.234,', '90', 'pt_BR', 1234.90),       # Amazon: parte inteira + a-price-fraction
+    ('R$ 99', None, 'pt_BR', 99.0),
+    ('12', '5', 'pt_BR', 12.50),              # centavo de um dígito é décimo
+    ('12', '05', 'pt_BR', 12.05),
+    ('1.234,56', '90', 'pt_BR', 1234.56),     # preço já tem decimal: centavos ignorados
+    ('$1,234.56', None, 'pt_BR', 1234.56),    # os dois separadores: o último é o decimal
+    ('$1,234.56', None, 'en_US', 1234.56),
+    ('$10.00 to $20.00', None, 'en_US', 10.0),
+    ('1.234.567', None, 'pt_BR', 1234567.0),
+])
+def test_normalizar_preco(texto, centavos, locale, esperado):
+    assert normalizar_preco(texto, centavos, locale) == pytest.approx(esperado)
+
+
+def test_sem_numero_vira_nan():
+    valores = normalizar_precos(['abc', None, '10'], [None, None, None])
+    assert math.isnan(valores[0]) and math.isnan(valores[1]) and valores[2] == 10.0
+
+
+ML = SITES_SUPORTADOS['mercado_livre']
+
+# Item com preço anterior (sem centavos) antes do preço atual (com centavos),
+# e item seguinte sem centavos: os centavos não podem migrar de um preço para outro
+PAGINA_ML = (
+    '<html><body><ol>'
+    '<li class="ui-search-layout__item"><a class="poly-component__title" href="/MLB-1">A</a>'
+    '<s class="andes-money-amount"><span class="andes-money-amount__fraction">2.000</span></s>'
+    '<span class="andes-money-amount"><span class="andes-money-amount__fraction">1.500</span>'
+    '<span class="andes-money-amount__cents">90</span></span></li>'
+    '<li class="ui-search-layout__item"><a class="poly-component__title" href="/MLB-2">B</a>'
+    '<span class="andes-money-amount"><span class="andes-money-amount__fraction">3.100</span></span></li>'
+    '</ol></body></html>'
+).encode()
+
+
+@pytest.mark.parametrize('backend', [b for b in BACKENDS if disponivel(b)])
+def test_centavos_vem_do_mesmo_elemento_do_preco(backend):
+    produtos = extrair_pagina(PAGINA_ML, ML['seletores'], ML['nome'], backend).produtos
+    assert [(p[1], p[5]) for p in produtos] == [('2.000', None), ('3.100', None)]
@@ -0,0 +1,57 @@
+"""Pool de sessões: aquecimentos (visitas à página inicial) por job"""
+
+import asyncio
+import time
+
+from session_pool import SessaoPool
+
+SITE = {'nome': 'Mercado Livre'}
+
+
+class _Sessao:
+    def __init__(self):
+        self.bloqueada = False
+        self.criada_em = time.time()
+        self.usos = 0
+
+    async def aclose(self):
+        pass
+
+
+def _pool(monkeypatch, **env):
+    for nome, valor in env.items():
+        monkeypatch.setenv(nome, valor)
+    pool = SessaoPool()
+    criadas = []
+
+    async def fabrica(site_config):
+        criadas.append(site_config['nome'])
+        return _Sessao()
+
+    pool.configurar(fabrica)
+    return pool, criadas
+
+
+async def _um_job(pool):
+    sessao = await pool.checkout(SITE)
+    await asyncio.sleep(0.01)  # tarefas de aquecimento em background teriam rodado
+    await pool.checkin(sessao, SITE)
+    await asyncio.sleep(0.01)
+
+
+def test_checkout_a_frio_aquece_so_a_sessao_do_job(monkeypatch):
+    pool, criadas = _pool(monkeypatch, SCRAPER_SESSION_POOL_SIZE='2')
+
+    async def _cenario():
+        await _um_job(pool)
+        await _um_job(pool)
+
+    asyncio.run(_cenario())
+    assert len(criadas) == 1  # o segundo job reaproveita a sessão devolvida
+    assert pool.estatisticas['reutilizadas'] == 1
+
+
+def test_reabastecimento_no_checkout_e_opcional(monkeypatch):
+    pool, criadas = _pool(monkeypatch, SCRAPER_SESSION_POOL_SIZE='2', SCRAPER_SESSION_EAGER_REFILL='1')
+    asyncio.run(_um_job(pool))
+    assert len(criadas) == 3  # a do job + 2 em background para completar o pool
@@ -0,0 +1,92 @@
+"""Single-flight: o líder sai (cancelado/removido) e o seguidor herda o scraping"""
+
+import pytest
+
+from conftest import esperar_status
+
+
+def _lider_e_seguidor(cliente, termo: str):
+    pedido = {'site': 'mercado_livre', 'termo_busca': termo, 'max_paginas': 3, 'delay': 0}
+    lider = cliente.post('/scraping', json=pedido).json()['job_id']
+    esperar_status(cliente, lider, status=('running',))
+    seguidor = cliente.post('/scraping', json=pedido).json()
+    assert lider in seguidor['message']  # entrou como seguidor
+    return lider, seguidor['job_id']
+
+
+@pytest.fixture(params=[False, True], ids=['lotes', 'pipeline'])
+def modo_pipeline(request, cliente, monkeypatch):
+    """Roda o teste nos dois modos de download (SCRAPER_PIPELINE=0/1)"""
+    import api
+    monkeypatch.setattr(api.fetch_engine, 'modo_pipeline', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('acao', ['cancelar', 'deletar'])
+def test_seguidor_assume_quando_o_lider_sai(cliente, loja, modo_pipeline, acao):
+    loja.configurar(latencia_ms=300.0)
+    lider, seguidor = _lider_e_seguidor(cliente, f'lider sai {acao} {modo_pipeline}')
+
+    if acao == 'cancelar':
+        resp = cliente.post(f'/job/{lider}/cancel')
+        assert resp.json()['status'] == 'cancelled'
+    else:
+        assert cliente.delete(f'/job/{lider}').status_code == 200
+        assert cliente.get(f'/job/{lider}').status_code == 404
+
+    dados = esperar_status(cliente, seguidor)
+    assert dados['status'] == 'completed'
+    assert dados['total_produtos'] == 150  # 3 páginas x 50 itens da loja local
+    assert len(dados['produtos']) == 150
+
+    if acao == 'cancelar':
+        dados_lider = cliente.get(f'/job/{lider}').json()
+        assert dados_lider['status'] == 'cancelled'
+        assert dados_lider['total_produtos'] < 150  # só o que tinha sido coletado
+
+
+def test_cancelar_lider_sem_seguidores_para_o_scraping(cliente, loja):
+    loja.configurar(latencia_ms=300.0)
+    pedido = {'site': 'mercado_livre', 'termo_busca': 'lider sozinho', 'max_paginas': 3, 'delay': 0}
+    lider = cliente.post('/scraping', json=pedido).json()['job_id']
+    esperar_status(cliente, lider, status=('running',))
+    cliente.post(f'/job/{lider}/cancel')
+    assert esperar_status(cliente, lider)['status'] == 'cancelled'
+
+
+def test_seguidor_gravado_por_referencia_sobrevive_a_remocao_do_lider(cliente, loja):
+    import api
+    loja.configurar(latencia_ms=200.0)
+    lider, seguidor = _lider_e_seguidor(cliente, 'seguidor por referencia')
+    assert esperar_status(cliente, seguidor)['status'] == 'completed'
+    assert esperar_status(cliente, lider)['status'] == 'completed'
+
+    # A lista de produtos vai ao journal uma vez só (a do líder)
+    with open(api.job_journal.journal_path, 'rb') as f:
+        linhas = [l for l in f if l.startswith(b'{"op":"produtos","id":"%s"' % seguidor.encode())]
+    assert linhas and all(b'"de":"%s"' % lider.encode() in l for l in linhas)
+    assert len(api.job_journal.ler(seguidor)['produtos']) == 150
+
+    assert cliente.delete(f'/job/{lider}').status_code == 200
+    assert len(api.job_journal.ler(seguidor)['produtos']) == 150
+    assert cliente.get(f'/job/{seguidor}').json()['total_produtos'] == 150
+
+
+def test_export_do_seguidor_nao_fica_preso_ao_lider_removido(cliente, loja):
+    import os
+    import api
+    loja.configurar(latencia_ms=200.0)
+    lider, seguidor = _lider_e_seguidor(cliente, 'export do seguidor')
+    esperar_status(cliente, seguidor)
+    esperar_status(cliente, lider)
+
+    # Enquanto compartilha os produtos, o seguidor usa o arquivo do líder
+    assert cliente.get(f'/job/{seguidor}/download', params={'format': 'csv'}).status_code == 200
+    assert os.path.exists(api.exportador_jobs.caminho(lider, 'csv'))
+
+    assert cliente.delete(f'/job/{lider}').status_code == 200
+    assert not os.path.exists(api.exportador_jobs.caminho(lider, 'csv'))
+    resp = cliente.get(f'/job/{seguidor}/download', params={'format': 'csv'})
+    assert resp.status_code == 200 and resp.text.count('\n') == 151  # cabeçalho + 150 produtos
+    assert os.path.exists(api.exportador_jobs.caminho(seguidor, 'csv'))
+    assert not os.path.exists(api.exportador_jobs.caminho(lider, 'csv'))